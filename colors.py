@@ -5,13 +5,19 @@ from __future__ import annotations
 import base64
 import io
 import xml.etree.ElementTree as ET
-from typing import Dict, Generator, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import matplotlib.colors as mcolors
+import numpy as np
 import webcolors  # type: ignore[import-untyped]
 from PIL import Image  # type: ignore[import-untyped]
+from scipy.spatial import cKDTree  # type: ignore[import-untyped]
 from shapely.geometry import Polygon
 
+from utils import centroid_coords
+
+SAMPLE_RADIUS_PX = 6
+
 
 def extract_image_from_svg(
     svg_tree: ET.ElementTree,
@@ -68,9 +74,30 @@ def svg_to_img_coords(
     return px, py
 
 
+def svg_to_img_coords_batch(
+    centroid_x: np.ndarray,
+    centroid_y: np.ndarray,
+    offset: Tuple[float, float],
+    svg_size: Tuple[float, float],
+    img_size: Tuple[int, int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert arrays of SVG coordinates to image pixel coordinates at once."""
+    svg_x, svg_y = offset
+    svg_w, svg_h = svg_size
+    img_w, img_h = img_size
+
+    # Handle missing width/height: default to bitmap's pixel size.
+    scale_x = img_w / svg_w if svg_w > 0 else 1.0
+    scale_y = img_h / svg_h if svg_h > 0 else 1.0
+
+    px = np.rint((np.asarray(centroid_x) - svg_x) * scale_x).astype(np.int64)
+    py = np.rint((np.asarray(centroid_y) - svg_y) * scale_y).astype(np.int64)
+    return px, py
+
+
 def average_color(
     poly: Polygon,
-    image: Image.Image,
+    image: Union[Image.Image, np.ndarray],
     offset: Tuple[float, float],
     svg_size: Tuple[float, float],
     radius: int,
@@ -79,7 +106,7 @@ def average_color(
 
     Args:
         poly: Polygon geometry.
-        image: PIL Image.
+        image: PIL Image, or its (height, width, 3) pixel array.
         offset: (SVG x, y) of the image.
         svg_size: (SVG width, height) of the image in SVG units.
         radius: Sampling radius in pixels.
@@ -87,55 +114,99 @@ def average_color(
     Returns:
         Averaged RGB tuple.
     """
-    px, py = svg_to_img_coords(
-        poly.centroid.x, poly.centroid.y, offset, svg_size, image.size
-    )
-    img_w, img_h = image.size
+    pixels = np.asarray(image)
+    img_h, img_w = pixels.shape[:2]
+    centroid = poly.centroid
+    px, py = svg_to_img_coords(centroid.x, centroid.y, offset, svg_size, (img_w, img_h))
+    return _window_mean(pixels, px, py, radius)
 
-    def neighbors() -> Generator[Tuple[int, int]]:
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                x, y = px + dx, py + dy
-                if 0 <= x < img_w and 0 <= y < img_h:
-                    yield x, y
 
-    pixels = [image.getpixel((x, y)) for x, y in neighbors()]
-    if not pixels:
+def _window_mean(
+    pixels: np.ndarray, px: int, py: int, radius: int
+) -> Tuple[int, int, int]:
+    """Return the floored mean RGB of the square pixel window around (px, py)."""
+    img_h, img_w = pixels.shape[:2]
+    x0, x1 = max(0, px - radius), min(img_w, px + radius + 1)
+    y0, y1 = max(0, py - radius), min(img_h, py + radius + 1)
+    if x0 >= x1 or y0 >= y1:
         return (0, 0, 0)
-    n = len(pixels)
-    r = sum(p[0] for p in pixels) // n
-    g = sum(p[1] for p in pixels) // n
-    b = sum(p[2] for p in pixels) // n
+    window = pixels[y0:y1, x0:x1, :3].reshape(-1, 3)
+    r, g, b = (int(c) for c in window.sum(axis=0, dtype=np.int64) // len(window))
     return (r, g, b)
 
 
-def closest_color_name(rgb: Tuple[int, int, int]) -> str:
-    """Return the name of the closest known color for an RGB value."""
+def _fix_name(name: str) -> str:
+    """Strip the ``xkcd:`` prefix from a matplotlib color name."""
+    if name.startswith("xkcd:"):
+        return name[5:]
+    return name
+
+
+# XKCD palette, precomputed once: parallel name list and (N, 3) RGB table.
+# Stored in reverse so that argmin ties resolve to the last-listed color.
+_XKCD_ITEMS = list(reversed(mcolors.XKCD_COLORS.items()))
+_XKCD_NAMES: List[str] = [_fix_name(name) for name, _ in _XKCD_ITEMS]
+_XKCD_RGB = np.array(
+    [webcolors.hex_to_rgb(hex_code) for _, hex_code in _XKCD_ITEMS],
+    dtype=np.int32,
+)
+_XKCD_TREE = cKDTree(_XKCD_RGB)
+# Neighbors fetched per query, so equidistant palette colors can be tie-broken.
+_TIE_CANDIDATES = 4
+
 
-    def fix_name(name):
-        if name.startswith("xkcd:"):
-            return name[5:]
-        return name
+def _nearest_palette_indices(rgbs: np.ndarray) -> np.ndarray:
+    """Return the nearest XKCD palette index for each row of an (P, 3) array.
 
+    Ties resolve to the lowest palette index, independent of tree layout. Rows
+    whose fetched neighbors are all equidistant may have further ties beyond
+    them, so those are settled by a full scan of the palette.
+    """
+    dists, idxs = _XKCD_TREE.query(rgbs, k=_TIE_CANDIDATES)
+    tied = dists == dists[:, :1]
+    nearest = np.where(tied, idxs, len(_XKCD_NAMES)).min(axis=1)
+    for row in np.flatnonzero(tied[:, -1]):
+        nearest[row] = np.argmin(((_XKCD_RGB - rgbs[row]) ** 2).sum(axis=1))
+    return nearest
+
+
+def _exact_color_name(rgb: Tuple[int, int, int]) -> Optional[str]:
+    """Return the CSS name for an exact RGB match, or None."""
     try:
-        return fix_name(webcolors.rgb_to_name(rgb))
+        return _fix_name(webcolors.rgb_to_name(rgb))
     except ValueError:
-        min_colors: Dict[int, str] = {}
-        for name, hex_code in mcolors.XKCD_COLORS.items():
-            r_c, g_c, b_c = webcolors.hex_to_rgb(hex_code)
-            rd = (r_c - rgb[0]) ** 2
-            gd = (g_c - rgb[1]) ** 2
-            bd = (b_c - rgb[2]) ** 2
-            min_colors[(rd + gd + bd)] = name
-        return fix_name(min_colors[min(min_colors)])
+        return None
+
+
+def closest_color_name(rgb: Tuple[int, int, int]) -> str:
+    """Return the name of the closest known color for an RGB value."""
+    return closest_color_names([rgb])[0]
+
+
+def closest_color_names(rgbs: List[Tuple[int, int, int]]) -> List[str]:
+    """Return the closest known color name for each RGB value in one pass.
+
+    Repeated colors share a single exact nearest-neighbor query.
+    """
+    if not rgbs:
+        return []
+    unique, inverse = np.unique(
+        np.asarray(rgbs, dtype=np.int32), axis=0, return_inverse=True
+    )
+    nearest = _nearest_palette_indices(unique)[inverse.reshape(-1)]
+    names = []
+    for rgb, idx in zip(rgbs, nearest):
+        name = _exact_color_name(rgb)
+        names.append(name if name is not None else _XKCD_NAMES[int(idx)])
+    return names
 
 
 def sample_polygon_color(
     poly: Polygon,
-    image: Image.Image,
+    image: Union[Image.Image, np.ndarray],
     offset: Tuple[float, float],
     svg_size: Tuple[float, float],
-    radius: int = 6,
+    radius: int = SAMPLE_RADIUS_PX,
 ) -> Tuple[str, Tuple[int, int, int]]:
     """Sample the bitmap color near a polygon's centroid with scaling."""
     rgb = average_color(poly, image, offset, svg_size, radius)
@@ -148,10 +219,19 @@ def polygon_color_map(
 ) -> Tuple[Dict[int, Tuple[int, int, int]], Dict[int, str]]:
     """Return RGB and name maps for polygons if the SVG contains an image."""
     image, offset, svg_size = extract_image_from_svg(svg_tree)
-    rgb_map: Dict[int, Tuple[int, int, int]] = {}
-    name_map: Dict[int, str] = {}
-    for idx, poly in enumerate(polygons):
-        name, rgb = sample_polygon_color(poly, image, offset, svg_size)
-        rgb_map[idx] = rgb
-        name_map[idx] = name
+    pixels = np.asarray(image)
+    img_size = (pixels.shape[1], pixels.shape[0])
+    # Vectorized centroids and pixel coordinates, then plain array slicing.
+    centroids = centroid_coords(polygons)
+    # Empty polygons have no centroid; sample them as black, like off-image ones.
+    valid = ~np.isnan(centroids[:, 0])
+    pxs, pys = svg_to_img_coords_batch(
+        centroids[valid, 0], centroids[valid, 1], offset, svg_size, img_size
+    )
+    rgbs = [(0, 0, 0)] * len(centroids)
+    for i, px, py in zip(np.flatnonzero(valid).tolist(), pxs.tolist(), pys.tolist()):
+        rgbs[i] = _window_mean(pixels, px, py, SAMPLE_RADIUS_PX)
+    names = closest_color_names(rgbs)
+    rgb_map: Dict[int, Tuple[int, int, int]] = dict(enumerate(rgbs))
+    name_map: Dict[int, str] = dict(enumerate(names))
     return rgb_map, name_map
@@ -1,13 +1,15 @@
 """Provide utilities for converting Shapely lines to convex hull polygons.
 
 Offer a function to extract convex hull polygons from a list of Shapely
-LineString objects using shapely's polygonize, unary_union, and convex_hull.
+LineString objects using shapely's polygonize, union_all, and convex_hull.
 """
 
 from typing import List
 
+import numpy as np
+import shapely
 from shapely.geometry import LineString, Polygon
-from shapely.ops import polygonize, unary_union
+from shapely.ops import polygonize
 
 from utils import remove_collinear_points
 
@@ -27,15 +29,12 @@ def lines_to_polygons(
     Returns:
         List of convex hull polygons as shapely.geometry.Polygon objects.
     """
-
-    def snap_line(line: LineString, tol: float = 1e-3) -> LineString:
-        def snap(v):
-            return round(v / tol) * tol
-
-        return LineString([(snap(x), snap(y)) for x, y in line.coords])
-
-    snapped_lines = [snap_line(line, tol=snap_tol) for line in lines]
-    merged = unary_union(snapped_lines)
+    coords, line_idx = shapely.get_coordinates(lines, return_index=True)
+    snapped = np.round(coords / snap_tol) * snap_tol
+    snapped_lines = shapely.linestrings(snapped, indices=line_idx)
+    # Single union on purpose: GEOS nodes all lines in one pass, and chunked
+    # unions of line arrangements measured slower, not faster.
+    merged = shapely.union_all(snapped_lines)
     polygons = polygonize(merged)
     return [
         remove_collinear_points(poly)
@@ -6,14 +6,111 @@ Provide utilities for grouping, coloring, and visualizing Shapely
 Polygon objects, along with geometric adjacency and grouping logic.
 """
 
-from typing import Dict, List, Set
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
 import numpy as np
-from shapely.geometry import LineString, Polygon
+import shapely
+from shapely.geometry import GeometryCollection, LineString, Polygon
 from shapely.geometry.base import BaseGeometry
-from shapely.ops import unary_union
+from shapely.strtree import STRtree
 
-from utils import collinear, remove_collinear_points
+from utils import collinear_mask, exterior_coords, remove_collinear_points
+
+EDGE_TOL = 1e-2
+
+# Undirected edge snapped to a tolerance grid: (x1, y1, x2, y2), smaller end first.
+EdgeKey = Tuple[int, ...]
+
+
+@dataclass
+class PolyCache:
+    """Exterior ring arrays for a polygon, computed once per grouping run."""
+
+    coords: np.ndarray
+    edges: np.ndarray
+    edge_keys: FrozenSet[EdgeKey]
+    area: float
+
+    @classmethod
+    def from_polygon(cls, poly: Polygon, tol: float = EDGE_TOL) -> "PolyCache":
+        """Build the cache from a polygon's exterior ring.
+
+        Edge keys are snapped to a `tol` grid; match them only against keys
+        built with the same tolerance.
+        """
+        coords = np.asarray(poly.exterior.coords)
+        edges = ring_edges(coords)
+        return cls(
+            coords=coords,
+            edges=edges,
+            edge_keys=polygon_edge_keys(edges, tol),
+            area=polygon_area(poly),
+        )
+
+    @classmethod
+    def from_polygons(
+        cls, polygons: List[Polygon], tol: float = EDGE_TOL
+    ) -> List["PolyCache"]:
+        """Build caches for many polygons with batched coordinate/area calls."""
+        per_ring = exterior_coords(polygons)
+        areas = np.abs(shapely.area(polygons)).tolist()
+        caches = []
+        for ring, area in zip(per_ring, areas):
+            edges = ring_edges(ring)
+            caches.append(
+                cls(
+                    coords=ring,
+                    edges=edges,
+                    edge_keys=polygon_edge_keys(edges, tol),
+                    area=area,
+                )
+            )
+        return caches
+
+
+def ring_edges(coords: np.ndarray) -> np.ndarray:
+    """Return a closed ring's directed edges as an (n - 1, 2, 2) array.
+
+    Args:
+        coords: (n, 2) array of ring coordinates, first point repeated last.
+
+    Returns:
+        Array where edges[k] = [start, end] of the k-th edge.
+    """
+    return np.stack([coords[:-1], coords[1:]], axis=1)
+
+
+def polygon_edges(poly: Union[Polygon, np.ndarray]) -> np.ndarray:
+    """Return a polygon's exterior edges, passing precomputed edges through."""
+    if isinstance(poly, np.ndarray):
+        return poly
+    return ring_edges(np.asarray(poly.exterior.coords))
+
+
+def polygon_edge_keys(
+    poly: Union[Polygon, np.ndarray, FrozenSet[EdgeKey]], tol: float
+) -> FrozenSet[EdgeKey]:
+    """Return a polygon's edges as hashable, direction-free keys on a tol grid.
+
+    Args:
+        poly: Polygon, its `polygon_edges` array, or already-built edge keys.
+        tol: Grid spacing used to snap edge endpoints.
+
+    Returns:
+        Frozen set of undirected EdgeKey tuples.
+    """
+    if isinstance(poly, frozenset):
+        return poly
+    snapped = np.round(polygon_edges(poly) / tol).astype(np.int64).reshape(-1, 4)
+    # Put the lexicographically smaller endpoint first, in array form.
+    swap = (snapped[:, 2] < snapped[:, 0]) | (
+        (snapped[:, 2] == snapped[:, 0]) & (snapped[:, 3] < snapped[:, 1])
+    )
+    snapped[swap] = snapped[swap][:, [2, 3, 0, 1]]
+    return frozenset(map(tuple, snapped.tolist()))
 
 
 def polygon_area(poly: Polygon) -> float:
@@ -44,6 +141,9 @@ def polygons_are_adjacent(p1: Polygon, p2: Polygon) -> bool:
 def build_polygon_adjacency(polygons: List[Polygon]) -> Dict[int, Set[int]]:
     """Build adjacency dict: key=index, value=set of neighbor indices.
 
+    All intersecting pairs come from one bulk STRtree query, so only polygons
+    with overlapping bounding boxes are tested, in a single GEOS call.
+
     Args:
         polygons: List of Shapely Polygon objects.
 
@@ -52,46 +152,89 @@ def build_polygon_adjacency(polygons: List[Polygon]) -> Dict[int, Set[int]]:
     """
     n = len(polygons)
     adjacency: Dict[int, Set[int]] = {i: set() for i in range(n)}
-    for i in range(n):
-        for j in range(i + 1, n):
-            if polygons_are_adjacent(polygons[i], polygons[j]):
-                adjacency[i].add(j)
-                adjacency[j].add(i)
+    left, right = STRtree(polygons).query(polygons, predicate="intersects")
+    upper = left < right  # Each pair once, without self-matches
+    for i, j in zip(left[upper].tolist(), right[upper].tolist()):
+        adjacency[i].add(j)
+        adjacency[j].add(i)
+    return adjacency
+
+
+def build_vertex_adjacency(
+    rings: List[np.ndarray], tol: float = EDGE_TOL
+) -> Dict[int, Set[int]]:
+    """Build adjacency dict linking polygons that share a vertex.
+
+    Vertices are snapped to a `tol` grid and hashed, so this is one pass over
+    all ring coordinates with no geometric predicates. A neighbor can only
+    share a full edge with a group if it shares that edge's end vertices, so
+    this is sufficient for `grow_group_from_seed`. Unlike
+    `build_polygon_adjacency`, it omits polygons that only touch mid-edge.
+
+    Args:
+        rings: Exterior ring coordinates, one (n, 2) array per polygon.
+        tol: Grid spacing used to snap vertices.
+
+    Returns:
+        Dict mapping polygon index to set of adjacent polygon indices.
+    """
+    vertex_owners: Dict[Tuple[int, ...], Set[int]] = defaultdict(set)
+    for i, coords in enumerate(rings):
+        for key in np.round(coords / tol).astype(np.int64).tolist():
+            vertex_owners[tuple(key)].add(i)
+
+    adjacency: Dict[int, Set[int]] = {i: set() for i in range(len(rings))}
+    for owners in vertex_owners.values():
+        if len(owners) > 1:
+            for i in owners:
+                adjacency[i].update(owners)
+    for i, neighbors in adjacency.items():
+        neighbors.discard(i)
     return adjacency
 
 
 def coords_equal(a, b, tol):
-    """Return True if the coordinates a and b are equal within tolerance tol."""
-    return np.allclose(a, b, atol=tol)
+    """Return True if the coordinates a and b are equal within tolerance tol.
+
+    Each axis must differ by strictly less than `tol`. This is a purely
+    absolute test: unlike the earlier ``np.allclose(a, b, atol=tol)`` it adds
+    no relative term, and a difference of exactly `tol` does not match.
+    """
+    return abs(a[0] - b[0]) < tol and abs(a[1] - b[1]) < tol
 
 
 def find_exact_full_shared_edge(
-    poly1: Polygon, poly2: Polygon, tol: float = 1e-6
+    poly1: Union[Polygon, np.ndarray, FrozenSet[EdgeKey]],
+    poly2: Union[Polygon, np.ndarray, FrozenSet[EdgeKey]],
+    tol: float = 1e-6,
 ) -> bool:
-    """Return True if poly1 and poly2 share an edge within tolerance tol."""
-    coords1 = list(poly1.exterior.coords)
-    coords2 = list(poly2.exterior.coords)
-    n1 = len(coords1)
-    n2 = len(coords2)
-
-    matches = 0
-    for i in range(n1 - 1):
-        a1, a2 = coords1[i], coords1[i + 1]
-        for j in range(n2 - 1):
-            b1, b2 = coords2[j], coords2[j + 1]
-            if (coords_equal(a1, b2, tol) and coords_equal(a2, b1, tol)) or (
-                coords_equal(a1, b1, tol) and coords_equal(a2, b2, tol)
-            ):
-                matches += 1
-    return matches == 1  # Only one shared edge (FPP-style)
-
-
-def is_concave(polygon: BaseGeometry, tol: float = 1e-2) -> bool:
-    """Return True if the polygon is concave based on convex hull area difference."""
-    convex = polygon.convex_hull
-    if convex.area < polygon.area:
+    """Return True if poly1 and poly2 share an edge within tolerance tol.
+
+    Either argument may be a Polygon, its `polygon_edges` array, or its
+    `polygon_edge_keys` set. Edges are hashed, so the check is one set
+    intersection rather than an all-pairs comparison.
+    """
+    keys1 = polygon_edge_keys(poly1, tol)
+    keys2 = polygon_edge_keys(poly2, tol)
+    return len(keys1 & keys2) == 1  # Only one shared edge (FPP-style)
+
+
+def is_concave(
+    polygon: BaseGeometry,
+    tol: float = 1e-2,
+    convex: Optional[BaseGeometry] = None,
+) -> bool:
+    """Return True if the polygon is concave based on convex hull area difference.
+
+    Pass `convex` to reuse an already computed convex hull of the polygon.
+    """
+    if convex is None:
+        convex = polygon.convex_hull
+    hull_area = convex.area
+    area = polygon.area
+    if hull_area < area:
         return False
-    return (convex.area / polygon.area - 1) > tol
+    return (hull_area / area - 1) > tol
 
 
 def grow_group_from_seed(
@@ -99,7 +242,8 @@ def grow_group_from_seed(
     polygons: List[Polygon],
     adjacency: Dict[int, Set[int]],
     already_grouped: Set[int],
-    tol: float = 1e-2,
+    tol: float = EDGE_TOL,
+    caches: Optional[List[PolyCache]] = None,
 ) -> List[int]:
     """Grow a group from a seed polygon index, adding adjacent neighbors.
 
@@ -109,12 +253,16 @@ def grow_group_from_seed(
         adjacency: Adjacency dict {index: set of neighbor indices}.
         already_grouped: Set of already grouped polygon indices.
         tol: Rounding tolerance for edge matching.
+        caches: Optional precomputed PolyCache per polygon, built with tol.
 
     Returns:
         List of polygon indices in the group, ordered by addition.
     """
+    if caches is None:
+        caches = PolyCache.from_polygons(polygons, tol)
     group_idxs = [seed_idx]
     current_shape = polygons[seed_idx]
+    current_keys = caches[seed_idx].edge_keys
     grouped = set([seed_idx]) | already_grouped
 
     while True:
@@ -126,12 +274,20 @@ def grow_group_from_seed(
         found = False
         for neighbor in candidates:
             neighbor_poly = polygons[neighbor]
-            match = find_exact_full_shared_edge(neighbor_poly, current_shape, tol)
+            match = find_exact_full_shared_edge(
+                caches[neighbor].edge_keys, current_keys, tol
+            )
             if match:
-                merged = current_shape.union(neighbor_poly)
-                if is_concave(merged) or not isinstance(merged.convex_hull, Polygon):
+                # The running shape and neighbor meet along the shared edge, so
+                # a collection stands in for their union without a GEOS overlay:
+                # its area is the summed area and its hull is the union's hull.
+                # The hull is computed once and reused for all three steps.
+                merged = GeometryCollection([current_shape, neighbor_poly])
+                hull = merged.convex_hull
+                if not isinstance(hull, Polygon) or is_concave(merged, convex=hull):
                     continue
-                current_shape = remove_collinear_points(merged.convex_hull)
+                current_shape = remove_collinear_points(hull)
+                current_keys = polygon_edge_keys(current_shape, tol)
                 group_idxs.append(neighbor)
                 grouped.add(neighbor)
                 found = True
@@ -155,20 +311,17 @@ def seam_is_collinear_with_bbox_edge(
         bool: True if the seam is collinear with any edge of the bounding box,
             False otherwise.
     """
-    bbox_edges = list(
-        zip(list(bbox.exterior.coords)[:-1], list(bbox.exterior.coords)[1:])
+    edges = polygon_edges(bbox)
+    a, b = edges[:, 0], edges[:, 1]
+    c, d = np.asarray(seam.coords)[[0, 1]]
+    # If both seam endpoints are collinear with an edge (a,b),
+    # we consider the seam collinear with the bbox edge
+    return bool(
+        np.any(
+            collinear_mask(a, b, c, tol, scaled=False)
+            & collinear_mask(a, b, d, tol, scaled=False)
+        )
     )
-    seam_coords = list(seam.coords)
-    for edge in bbox_edges:
-        a, b = edge
-        # Check both endpoints of seam for collinearity with the bbox edge
-        # If both seam endpoints are collinear with the edge (a,b),
-        # we consider the seam collinear with the bbox edge
-        if collinear(a, b, seam_coords[0], tol) and collinear(
-            a, b, seam_coords[1], tol
-        ):
-            return True
-    return False
 
 
 def classify_seams(
@@ -185,31 +338,35 @@ def classify_seams(
     seams = list(lines)
     n = len(seams)
 
+    # All crossing seam pairs from one bulk STRtree query
+    crossings: Dict[int, Set[int]] = {i: set() for i in range(n)}
+    if n:
+        left, right = STRtree(seams).query(seams, predicate="intersects")
+        for i, j in zip(left.tolist(), right.tolist()):
+            if i != j:
+                crossings[i].add(j)
+
     # 0th order: collinear with bbox edge
     for i, seam in enumerate(seams):
         if seam_is_collinear_with_bbox_edge(seam, bounding_box, tol):
             seam_orders[i] = 0
 
     # 1st order: crosses TWO 0th order seams
-    for i, seam in enumerate(seams):
+    for i in range(n):
         if i in seam_orders:
             continue
-        crosses_edge = sum(
-            seam.intersects(seams[j]) for j, order in seam_orders.items() if order == 0
-        )
+        crosses_edge = sum(seam_orders.get(j) == 0 for j in crossings[i])
         if crosses_edge == 2:
             seam_orders[i] = 1
 
     # Higher order: crosses previous order
     current_order = 2
     while len(seam_orders) < n:
-        for i, seam in enumerate(seams):
+        for i in range(n):
             if i in seam_orders:
                 continue
             crosses_prev = any(
-                seam.intersects(seams[j])
-                for j, order in seam_orders.items()
-                if order == current_order - 1
+                seam_orders.get(j) == current_order - 1 for j in crossings[i]
             )
             if crosses_prev:
                 seam_orders[i] = current_order
@@ -220,7 +377,7 @@ def classify_seams(
 
 
 def polygon_max_seam_order(
-    poly: Polygon,
+    poly: Union[Polygon, np.ndarray],
     seams: List[LineString],
     seam_orders: Dict[int, int],
     tol: float = 1e1,
@@ -228,7 +385,7 @@ def polygon_max_seam_order(
     """Return the highest seam order used by the edges of this polygon.
 
     Args:
-        poly (Polygon): Polygon to check.
+        poly (Polygon): Polygon to check, or its precomputed edges array.
         seams (List[LineString]): List of LineStrings (seams).
         seam_orders (Dict[int, int]): Mapping seam index to order.
         tol (float): Tolerance for collinearity.
@@ -236,23 +393,30 @@ def polygon_max_seam_order(
     Returns:
         int: Maximum seam order present among the edges (or -1 if none match).
     """
-    max_order = -1
-    poly_edges = list(
-        zip(list(poly.exterior.coords)[:-1], list(poly.exterior.coords)[1:])
+    # Only check seams that are 2-point LineStrings
+    seam_coords = [(i, list(seam.coords)) for i, seam in enumerate(seams)]
+    seam_coords = [(i, sc) for i, sc in seam_coords if len(sc) == 2]
+    edges = polygon_edges(poly)
+    if not seam_coords or not len(edges):
+        return -1
+    seam_ends = np.array([sc for _, sc in seam_coords], dtype=float)
+
+    # Broadcast every polygon edge (a, b) against every seam (c, d)
+    a, b = edges[:, None, 0], edges[:, None, 1]
+    c, d = seam_ends[None, :, 0], seam_ends[None, :, 1]
+    # Edges are considered equal if both endpoints are collinear
+    on_seam = (
+        collinear_mask(a, b, c, tol, scaled=False)
+        & collinear_mask(a, b, d, tol, scaled=False)
+    ) | (
+        collinear_mask(c, d, a, tol, scaled=False)
+        & collinear_mask(c, d, b, tol, scaled=False)
+    )
+    hits = on_seam.any(axis=0)
+    return max(
+        (seam_orders.get(i, -1) for (i, _), hit in zip(seam_coords, hits) if hit),
+        default=-1,
     )
-    for edge in poly_edges:
-        a, b = edge
-        for i, seam in enumerate(seams):
-            sc = list(seam.coords)
-            # Only check seam if it is a 2-point LineString
-            if len(sc) == 2:
-                c, d = sc
-                # Edges are considered equal if both endpoints are collinear
-                if (collinear(a, b, c, tol) and collinear(a, b, d, tol)) or (
-                    collinear(c, d, a, tol) and collinear(c, d, b, tol)
-                ):
-                    max_order = max(max_order, seam_orders.get(i, -1))
-    return max_order
 
 
 def group_polygons(polygons: List[Polygon], lines: List[LineString]) -> List[List[int]]:
@@ -268,25 +432,30 @@ def group_polygons(polygons: List[Polygon], lines: List[LineString]) -> List[Lis
     Raises:
         ValueError if bounding box is not a Polygon
     """
-    bounding_box = unary_union(polygons).convex_hull
+    # Hull of the collection equals the hull of the union, without the overlay
+    bounding_box = GeometryCollection(polygons).convex_hull
     if not isinstance(bounding_box, Polygon):
         raise ValueError("Bounding box must be a Polygon.")
     seam_orders = classify_seams(lines, bounding_box)
-    polygon_orders = [polygon_max_seam_order(p, lines, seam_orders) for p in polygons]
-
-    adjacency = build_polygon_adjacency(polygons)
+    caches = PolyCache.from_polygons(polygons)
+    orders = [polygon_max_seam_order(c.edges, lines, seam_orders) for c in caches]
+
+    adjacency = build_vertex_adjacency([c.coords for c in caches])
+    # Highest seam order first, then smallest area, then lowest index
+    seed_heap = [
+        (-order, c.area, i) for i, (order, c) in enumerate(zip(orders, caches))
+    ]
+    heapq.heapify(seed_heap)
     already_grouped: Set[int] = set()
     groups: List[List[int]] = []
     n = len(polygons)
     while len(already_grouped) < n:
-        candidates = [i for i in range(n) if i not in already_grouped]
-        # Find the highest order present among ungrouped polygons
-        highest_order = max(polygon_orders[i] for i in candidates)
-        # Filter to only those with that order
-        seed_candidates = [i for i in candidates if polygon_orders[i] == highest_order]
-        # Of these, pick the smallest area as seed
-        seed = min(seed_candidates, key=lambda idx: polygon_area(polygons[idx]))
-        group = grow_group_from_seed(seed, polygons, adjacency, already_grouped)
+        while seed_heap[0][2] in already_grouped:
+            heapq.heappop(seed_heap)
+        _, _, seed = heapq.heappop(seed_heap)
+        group = grow_group_from_seed(
+            seed, polygons, adjacency, already_grouped, caches=caches
+        )
         groups.append(list(group))
         already_grouped.update(group)
     return groups
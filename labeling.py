@@ -4,11 +4,15 @@ Provide utilities to label polygons by group and piece number,
 and to extract label positions (using centroids).
 """
 
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 from shapely.geometry import Polygon
 
+from utils import centroid_coords
 
+
+@lru_cache(maxsize=None)
 def int_to_label(n: int) -> str:
     """Convert an integer to a label using the A1 notation.
 
@@ -61,7 +65,8 @@ def get_label_positions(
     """
     if indices is None:
         indices = list(range(len(polygons)))
-    return {i: polygons[i].centroid.coords[0] for i in indices}
+    coords = centroid_coords([polygons[i] for i in indices]).tolist()
+    return {i: tuple(xy) for i, xy in zip(indices, coords)}
 
 
 def label_polygons(
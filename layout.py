@@ -4,18 +4,26 @@ Provide utilities to layout groups with seam allowances on pages,
 using translation and rotation to fit within printable areas.
 """
 
+import warnings
 from dataclasses import dataclass
+from math import atan2, ceil, degrees, floor
 from typing import Dict, List, Optional, Tuple, Union, cast
 
+import numpy as np
+import shapely
 from pyclipper import MinkowskiSum  # type: ignore[import-untyped]
 from shapely import unary_union
-from shapely.affinity import rotate as shapely_rotate
-from shapely.affinity import translate as shapely_translate
-from shapely.geometry import LineString, MultiLineString, Polygon, box
+from shapely.affinity import affine_transform
+from shapely.geometry import (
+    LineString,
+    MultiLineString,
+    Polygon,
+    box,
+)
 from shapely.geometry.base import BaseGeometry
 from tqdm import tqdm
 
-from utils import remove_collinear_points
+from utils import remove_collinear_points_batch, rotation_matrix
 
 
 @dataclass
@@ -57,20 +65,54 @@ def _polygon_exterior_coords(geom: BaseGeometry) -> List[Tuple[float, ...]]:
     return [cast(Tuple[float, ...], (c[0], c[1])) for c in poly.exterior.coords]
 
 
-def minimal_bounding_box_rotation(poly: Polygon, step: int = 5) -> Tuple[Polygon, int]:
-    """Rotate a polygon to minimize its bounding box area."""
-    min_area = float("inf")
-    best_angle = 0
-    best_poly = poly
-    for angle in range(0, 180, step):
-        rotated = shapely_rotate(poly, angle, origin="centroid", use_radians=False)
-        minx, miny, maxx, maxy = rotated.bounds
-        area = (maxx - minx) * (maxy - miny)
-        if area < min_area:
-            min_area = area
-            best_angle = angle
-            best_poly = rotated
-    return best_poly, best_angle
+def minimal_bounding_box_rotation(
+    poly: Polygon, step: Optional[int] = None
+) -> Tuple[Polygon, int]:
+    """Rotate a polygon to minimize its bounding box area.
+
+    The optimal direction comes from GEOS's minimum rotated rectangle
+    (rotating calipers). Rotations are whole degrees, so the two integer
+    angles either side of the optimum are evaluated on the vertex array and
+    only the better one is built as a Shapely polygon.
+
+    Args:
+        poly: Polygon to rotate.
+        step: Deprecated and ignored; passing it emits a DeprecationWarning.
+            It was the angle step of the old sweep search.
+
+    Returns:
+        The rotated polygon and its rotation angle in degrees.
+    """
+    if step is not None:
+        warnings.warn(
+            "minimal_bounding_box_rotation's step is ignored and will be removed",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    mrr = poly.minimum_rotated_rectangle
+    # Degenerate input (collinear or coincident vertices) yields a line or
+    # point with no edge direction to align to.
+    if not isinstance(mrr, Polygon):
+        return poly, 0
+    # One coordinate read serves the bounds here and the rotations below.
+    x, y = np.asarray(poly.exterior.coords).T
+    # Already optimal without rotating (e.g. axis-aligned rectangles): the
+    # bounding box matches the minimum rotated rectangle.
+    if np.ptp(x) * np.ptp(y) <= mrr.area * (1 + 1e-9):
+        return poly, 0
+    (x0, y0), (x1, y1) = mrr.exterior.coords[:2]
+    # Box area repeats every 90 degrees; rotating by -theta aligns the edge.
+    optimum = -degrees(atan2(y1 - y0, x1 - x0)) % 90
+    angles = [floor(optimum), ceil(optimum)]
+    origin = poly.centroid.coords[0]
+    matrices = np.array([rotation_matrix(angle, origin) for angle in angles])
+    a, b, d, e, xoff, yoff = (col[:, None] for col in matrices.T)
+    rotated_x = a * x + b * y + xoff
+    rotated_y = d * x + e * y + yoff
+    areas = np.ptp(rotated_x, axis=1) * np.ptp(rotated_y, axis=1)
+    best = int(np.argmin(areas))
+    best_poly = affine_transform(poly, tuple(matrices[best].tolist()))
+    return best_poly, angles[best]
 
 
 def minkowski(
@@ -87,20 +129,43 @@ def minkowski(
     Returns:
         List[Polygon]: A list of polygons representing the Minkowski sum or difference.
     """
-    coords1 = _polygon_exterior_coords(poly1)[:-1]
-    coords1 = [(int(x * scale), int(y * scale)) for x, y in coords1]
-
-    coords2 = _polygon_exterior_coords(poly2)[:-1]
-    x0, y0 = coords2[0]
-    coords2 = [(x - x0, y - y0) for x, y in coords2]
+    coords1 = np.asarray(_polygon_exterior_coords(poly1)[:-1])
+    coords2 = np.asarray(_polygon_exterior_coords(poly2)[:-1])
+    coords2 = coords2 - coords2[0]
     if not diff:
         # Reflect poly2 about the origin
-        coords2 = [(-x, -y) for x, y in coords2]
-    coords2 = [(int(x * scale), int(y * scale)) for x, y in coords2]
+        coords2 = -coords2
+    # astype truncates toward zero, like int().
+    int1 = (coords1 * scale).astype(np.int64).tolist()
+    int2 = (coords2 * scale).astype(np.int64).tolist()
 
-    mink_raw = MinkowskiSum(coords1, coords2, True)
-    mink = [Polygon([(x / scale, y / scale) for (x, y) in poly]) for poly in mink_raw]
-    return mink
+    mink_raw = MinkowskiSum(int1, int2, True)
+    if not mink_raw:
+        return []
+    # Build every output ring with one vectorized constructor call.
+    coords = np.concatenate([np.asarray(path, dtype=float) for path in mink_raw])
+    ring_ids = np.repeat(np.arange(len(mink_raw)), [len(path) for path in mink_raw])
+    rings = shapely.linearrings(coords / scale, indices=ring_ids)
+    return list(shapely.polygons(rings))
+
+
+def translated_copies(geom: BaseGeometry, offsets: np.ndarray) -> np.ndarray:
+    """Return copies of `geom` shifted by each (dx, dy) row of `offsets`.
+
+    All copies are produced by one broadcast add over the coordinates and a
+    single `shapely.set_coordinates` call, rather than an affine transform per
+    copy.
+
+    Args:
+        geom: Geometry to copy.
+        offsets: (k, 2) array of translations.
+
+    Returns:
+        Array of k translated geometries.
+    """
+    coords = shapely.get_coordinates(geom)
+    moved = (coords[np.newaxis, :, :] + offsets[:, np.newaxis, :]).reshape(-1, 2)
+    return shapely.set_coordinates(np.full(len(offsets), geom, dtype=object), moved)
 
 
 def score_placements(placements: List[Placement]) -> float:
@@ -116,7 +181,19 @@ def score_placements(placements: List[Placement]) -> float:
     Returns:
         A float score; lower is better (less area used).
     """
-    return unary_union([p.poly for p in placements]).convex_hull.area
+    return bounds_area(placements_bounds(placements))
+
+
+def placements_bounds(placements: List[Placement]) -> Tuple[float, ...]:
+    """Return the (minx, miny, maxx, maxy) bounding box of all placed polygons."""
+    bounds = shapely.bounds([p.poly for p in placements])
+    return (*bounds[:, :2].min(axis=0).tolist(), *bounds[:, 2:].max(axis=0).tolist())
+
+
+def bounds_area(bounds: Tuple[float, ...]) -> float:
+    """Return the area of a (minx, miny, maxx, maxy) bounding box."""
+    minx, miny, maxx, maxy = bounds
+    return (maxx - minx) * (maxy - miny)
 
 
 class PageLayoutEngine:
@@ -135,6 +212,8 @@ class PageLayoutEngine:
         self.seam_allowances = seam_allowances
         self.config = config
         self.grow = (config.margin_between / 2) * config.svg_units_per_in
+        self._fit_cache: Dict[Tuple[int, int], Tuple[Polygon, Optional[Polygon]]] = {}
+        self._origins: Dict[int, Tuple[float, ...]] = {}
 
         inner_width = (
             config.page_width_in - 2 * config.margin_in
@@ -179,17 +258,36 @@ class PageLayoutEngine:
 
         If it does not fit at any rotation, raise an error.
         """
+        bx0, by0, bx1, by1 = self.box.bounds
+        x1, y1 = self.box.exterior.coords[0]
+        x, y = np.asarray(poly.exterior.coords).T
+        origin = poly.centroid.coords[0]
         for ang in [0, 90, 45, 135]:
-            rotated = shapely_rotate(poly, ang, origin="centroid").normalize()
-            rotated = _as_polygon(rotated)
-            x0, y0, _, _ = rotated.bounds
-            x1, y1 = self.box.exterior.coords[0]
-            dx, dy = x1 - x0, y1 - y0
-            rotated_t = shapely_translate(rotated, xoff=dx, yoff=dy)
-            rotated_t = _as_polygon(rotated_t)
-            if self.box.contains(rotated_t.buffer(-tol)):
+            # Fit-test on rotated vertex arrays; only the accepted rotation is
+            # built as a polygon.
+            matrix = rotation_matrix(ang, origin)
+            a, b, d, e, xoff, yoff = matrix
+            xs = a * x + b * y + xoff
+            ys = d * x + e * y + yoff
+            dx, dy = x1 - xs.min(), y1 - ys.min()
+            # The page box is axis-aligned, so containment (with `tol` slack
+            # for rounding) reduces to comparing bounds.
+            if (
+                xs.min() + dx >= bx0 - tol
+                and ys.min() + dy >= by0 - tol
+                and xs.max() + dx <= bx1 + tol
+                and ys.max() + dy <= by1 + tol
+            ):
+                rotated = _as_polygon(affine_transform(poly, matrix).normalize())
+                rotated_t = _as_polygon(
+                    translated_copies(rotated, np.array([[dx, dy]]))[0]
+                )
                 return Placement(
-                    group_idx=idx, rotation=angle + ang, dx=dx, dy=dy, poly=rotated_t
+                    group_idx=idx,
+                    rotation=angle + ang,
+                    dx=float(dx),
+                    dy=float(dy),
+                    poly=rotated_t,
                 )
         raise ValueError(f"Largest piece (group {idx}) cannot be placed on the page.")
 
@@ -202,46 +300,76 @@ class PageLayoutEngine:
         """
 
         def candidate_placements_for_rotation(
-            rotated: Polygon, ang: int
+            rotated: Polygon, ifp: Optional[Polygon], ang: int
         ) -> List[Placement]:
-            nfp_parts = [unary_union(minkowski(p.poly, rotated)) for p in placed]
-            nfp = unary_union(nfp_parts).boundary
-            ifp_raw = minkowski(self.box, rotated)
-            if len(ifp_raw) == 1:
+            # Rotations that cannot fit the page need no no-fit polygons.
+            if ifp is None:
                 return []
-            ifp = _as_polygon(ifp_raw[1])
+            nfp_parts = [part for p in placed for part in minkowski(p.poly, rotated)]
+            nfp = unary_union(nfp_parts).boundary
             valid = ifp.intersection(nfp)
             # Accept only if valid is LineString or MultiLineString
             if isinstance(valid, (LineString, MultiLineString)):
                 coords = self._extract_coords(valid)
             else:
                 coords = []
-            candidates = []
+            if not coords:
+                return []
             x0, y0 = rotated.exterior.coords[0]
-            for coord in coords:
-                dx, dy = coord[0] - x0, coord[1] - y0
-                candidates.append(
-                    Placement(
-                        group_idx=idx,
-                        rotation=angle + ang,
-                        dx=dx,
-                        dy=dy,
-                        poly=shapely_translate(rotated, xoff=dx, yoff=dy),
-                    )
+            offsets = np.asarray(coords, dtype=float)[:, :2] - (x0, y0)
+            moved = translated_copies(rotated, offsets)
+            return [
+                Placement(
+                    group_idx=idx,
+                    rotation=angle + ang,
+                    dx=dx,
+                    dy=dy,
+                    poly=candidate_poly,
                 )
-            return candidates
+                for (dx, dy), candidate_poly in zip(offsets.tolist(), moved)
+            ]
 
+        # The placed pieces are fixed during this call, so their bounding box
+        # is computed once; each candidate only widens it by its own bounds.
+        px0, py0, px1, py1 = placements_bounds(placed)
         best: Optional[Placement] = None
+        best_score = float("inf")
         for ang in [0, 45, 90, 135, 180, 225, 270, 315]:
-            rotated = shapely_rotate(poly, ang, origin="centroid").normalize()
-            rotated = _as_polygon(rotated)
-            candidates = candidate_placements_for_rotation(rotated, ang)
+            rotated, ifp = self._rotated_fit(idx, poly, ang)
+            candidates = candidate_placements_for_rotation(rotated, ifp, ang)
             for candidate in candidates:
-                score = score_placements(placed + [candidate])
-                if best is None or score < score_placements(placed + [best]):
+                cx0, cy0, cx1, cy1 = candidate.poly.bounds
+                score = bounds_area(
+                    (min(px0, cx0), min(py0, cy0), max(px1, cx1), max(py1, cy1))
+                )
+                if score < best_score:
                     best = candidate
+                    best_score = score
         return best
 
+    def _rotated_fit(
+        self, idx: int, poly: Polygon, ang: int
+    ) -> Tuple[Polygon, Optional[Polygon]]:
+        """Return the rotated polygon and its inner-fit polygon on the page.
+
+        Neither depends on what is already placed, so both are cached per
+        (group, angle) and reused each time the group is tried on another page.
+
+        Returns:
+            (rotated polygon, inner-fit polygon or None if it cannot fit).
+        """
+        key = (idx, ang)
+        if key not in self._fit_cache:
+            # One centroid per group, shared by all its rotation matrices.
+            if idx not in self._origins:
+                self._origins[idx] = poly.centroid.coords[0]
+            matrix = rotation_matrix(ang, self._origins[idx])
+            rotated = _as_polygon(affine_transform(poly, matrix).normalize())
+            ifp_raw = minkowski(self.box, rotated)
+            ifp = _as_polygon(ifp_raw[1]) if len(ifp_raw) > 1 else None
+            self._fit_cache[key] = (rotated, ifp)
+        return self._fit_cache[key]
+
     def _extract_coords(
         self, valid: Union[LineString, MultiLineString]
     ) -> List[Tuple[float, ...]]:
@@ -259,14 +387,25 @@ class PageLayoutEngine:
         Sort polygons by area, rotating them to minimize bounding box size,
         and applying a buffer for inter-piece margin.
         """
-        to_pack: List[Tuple[int, Polygon, int]] = []
-        for idx, poly in sorted(self.seam_allowances.items(), key=lambda x: -x[1].area):
-            poly, angle = minimal_bounding_box_rotation(poly)
-            poly = poly.buffer(self.grow, join_style="mitre")
-            poly = remove_collinear_points(poly)
-            poly = _as_polygon(poly.normalize())
-            to_pack.append((idx, poly, angle))
-        return to_pack
+        if not self.seam_allowances:
+            return []
+        # The per-group Shapely steps each run as one vectorized call over
+        # all groups; only the rotation search and cleanup stay per polygon.
+        keys = list(self.seam_allowances)
+        polys = np.asarray(list(self.seam_allowances.values()), dtype=object)
+        order = np.argsort(-shapely.area(polys), kind="stable")
+        idxs = [keys[i] for i in order]
+        fitted = [minimal_bounding_box_rotation(poly) for poly in polys[order]]
+        rotated = np.asarray([poly for poly, _ in fitted], dtype=object)
+        grown = shapely.buffer(rotated, self.grow, join_style="mitre")
+        cleaned = np.asarray(remove_collinear_points_batch(list(grown)), dtype=object)
+        # Drop near-collinear vertices: Minkowski cost scales with vertex
+        # count, and a tenth of the margin keeps pieces from touching.
+        simple = shapely.simplify(cleaned, self.grow * 0.1, preserve_topology=True)
+        return [
+            (idx, _as_polygon(poly), angle)
+            for idx, poly, (_, angle) in zip(idxs, shapely.normalize(simple), fitted)
+        ]
 
 
 def layout_groups(
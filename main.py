@@ -42,6 +42,8 @@ class PipelineConfig:
     pdf_file: str
     png_file: str
     flip_pieces: bool = True
+    # Off by default: PDF piece outlines are drawn from the exact geometry.
+    render_simplify_in: Optional[float] = None
 
 
 @dataclass
@@ -117,6 +119,13 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Do not flip pieces in the PDF (show right side)",
     )
+    parser.add_argument(
+        "--render-simplify",
+        dest="render_simplify_in",
+        type=float,
+        default=None,
+        help="Drop PDF piece vertices within this many inches of a straight line",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -144,9 +153,10 @@ def parse_svg_and_geometry(state: PipelineState) -> PipelineState:
     from utils import get_svg_units_per_inch
 
     logger.info("Parsing SVG file %s", state.svg_file)
-    state.svg_units_per_in = get_svg_units_per_inch(state.svg_file)
+    # Parse the XML once and share the tree between the readers.
     state.svg_tree = ET.parse(state.svg_file)
-    state.lines = parse_svg(state.svg_file)
+    state.svg_units_per_in = get_svg_units_per_inch(state.svg_file, tree=state.svg_tree)
+    state.lines = parse_svg(state.svg_file, tree=state.svg_tree)
     state.polygons = lines_to_polygons(state.lines)
     logger.info("Parsed %d polygons", len(state.polygons))
     return state
@@ -268,6 +278,11 @@ def export_pdf(state: PipelineState, config: PipelineConfig) -> None:
         page_height_in=config.page_height_in,
         svg_units_per_in=state.svg_units_per_in,
         flip_y=config.flip_pieces,
+        render_simplify_tol=(
+            config.render_simplify_in * state.svg_units_per_in
+            if config.render_simplify_in
+            else None
+        ),
     )
     logger.info("Saving PDF output to %s", config.pdf_file)
     pdf_writer(pdf_writer_args)
@@ -295,6 +310,7 @@ def run_pipeline(args: argparse.Namespace) -> None:
         pdf_file=args.pdf_file,
         png_file=args.png_file,
         flip_pieces=not args.no_flip,
+        render_simplify_in=args.render_simplify_in,
     )
     ensure_output_dirs(config)
     state = PipelineState(svg_file=args.svg_file)
@@ -4,13 +4,17 @@ import logging
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+import shapely
 from reportlab.lib.colors import HexColor, black
+from reportlab.lib.rl_accel import fp_str
 from reportlab.lib.units import inch
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas as rl_canvas
-from shapely.affinity import rotate as shapely_rotate
-from shapely.affinity import translate as shapely_translate
-from shapely.geometry import Point, Polygon
+from reportlab.pdfgen.pathobject import PDFPathObject
+from shapely.geometry import Polygon
+
+from utils import exterior_coords, rotation_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,7 @@ def transform_group_shapes(
     rotation: float,
     dx: float,
     dy: float,
+    origin: Optional[Tuple[float, ...]] = None,
 ) -> Tuple[List[Polygon], Polygon]:
     """Rotate and translate group polygons and seam allowance.
 
@@ -37,18 +42,39 @@ def transform_group_shapes(
         rotation: Rotation angle in degrees.
         dx: X translation (SVG units).
         dy: Y translation (SVG units).
+        origin: Precomputed seam allowance centroid to rotate about; computed
+            from `seam_poly` if omitted.
 
     Returns:
         (transformed group polygons, transformed seam polygon)
     """
-    origin = seam_poly.centroid
-    seam_poly_rot = shapely_rotate(seam_poly, rotation, origin=origin)
-    group_polys_rot = [shapely_rotate(p, rotation, origin=origin) for p in group_polys]
-    seam_poly_final = shapely_translate(seam_poly_rot, dx, dy)
-    group_polys_final = [shapely_translate(p, dx, dy) for p in group_polys_rot]
+    if origin is None:
+        origin = seam_poly.centroid.coords[0]
+    matrix = rotation_matrix(rotation, origin, dx, dy)
+    seam_poly_final, *group_polys_final = transform_shapes(
+        [seam_poly, *group_polys], matrix
+    )
     return group_polys_final, seam_poly_final
 
 
+def transform_points(points: np.ndarray, matrix: Tuple[float, ...]) -> np.ndarray:
+    """Apply an (a, b, d, e, xoff, yoff) affine matrix to an (n, 2) point array."""
+    a, b, d, e, xoff, yoff = matrix
+    return points @ np.array([[a, d], [b, e]]) + np.array([xoff, yoff])
+
+
+def transform_shapes(geoms: List[Polygon], matrix: Tuple[float, ...]) -> List[Polygon]:
+    """Apply one affine matrix to all coordinates of `geoms` in a single pass."""
+    return list(shapely.transform(geoms, lambda xy: transform_points(xy, matrix)))
+
+
+def _ring_path_code(pts: np.ndarray) -> List[str]:
+    """Return PDF path operators (m, l..., h) tracing an (n, 2) point ring."""
+    numbers = fp_str(*pts.ravel().tolist()).split(" ")
+    xy = [f"{x} {y}" for x, y in zip(numbers[::2], numbers[1::2])]
+    return [f"{xy[0]} m", *(f"{pt} l" for pt in xy[1:]), "h"]
+
+
 def apply_transform(
     geom: Polygon,
     rotation: float = 0,
@@ -56,9 +82,11 @@ def apply_transform(
     dy: float = 0,
 ) -> Polygon:
     """Rotate and translate a geometry (polygon or point)."""
-    if rotation != 0:
-        geom = shapely_rotate(geom, rotation, origin="centroid")
-    return shapely_translate(geom, dx, dy)
+    if rotation % 360 == 0 and dx == 0 and dy == 0:
+        return geom
+    # A whole number of turns is a pure shift, so skip the centroid lookup.
+    origin = geom.centroid.coords[0] if rotation % 360 else (0.0, 0.0)
+    return transform_shapes([geom], rotation_matrix(rotation, origin, dx, dy))[0]
 
 
 @dataclass
@@ -78,6 +106,26 @@ class PDFWriterArgs:
     svg_units_per_in: float = 96.0
     label_fontsize: int = 24
     flip_y: bool = True
+    # (N_i, 2) exterior coordinates of each polygon, derived if not given.
+    polygon_coords: Optional[List[np.ndarray]] = None
+    # If set, drop piece vertices within this distance (SVG units) of their
+    # neighbors' chord before rendering, shrinking the content stream. Opt-in
+    # (main.py's --render-simplify), since it alters the drawn outlines.
+    render_simplify_tol: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        """Extract the polygon coordinate arrays once, for all rendering."""
+        if self.polygon_coords is None:
+            polys = self.polygons
+            if self.render_simplify_tol:
+                polys = list(
+                    shapely.simplify(
+                        np.asarray(polys, dtype=object),
+                        self.render_simplify_tol,
+                        preserve_topology=True,
+                    )
+                )
+            self.polygon_coords = exterior_coords(polys)
 
 
 @dataclass
@@ -89,6 +137,8 @@ class LabelDrawArgs:
     dx: float
     dy: float
     seam_poly: Polygon
+    # Centroid of seam_poly, shared by all labels of a placement.
+    origin: Optional[Tuple[float, ...]] = None
 
 
 class PDFPolygonWriter:
@@ -105,22 +155,41 @@ class PDFPolygonWriter:
         self.stroke_color: Any = black
         self.alpha: float = 1.0
         self.linewidth: float = 1.0
+        # Font metrics are fixed for the whole document; look them up once.
+        self._label_offset = text_center_offset("Helvetica-Bold", args.label_fontsize)
+        # Page (width, height) in SVG units, for culling off-page shapes.
+        self._page_extent = (
+            np.array([args.page_width_in, args.page_height_in]) * args.svg_units_per_in
+        )
+        self._seam_centroids = {
+            group_idx: seam.centroid.coords[0]
+            for group_idx, seam in args.seam_allowances.items()
+        }
+        self._seam_coords = {
+            group_idx: np.asarray(seam.exterior.coords, dtype=float)
+            for group_idx, seam in args.seam_allowances.items()
+        }
 
     def draw_polygon(self, poly: Polygon) -> None:
         """Draw a polygon on the instance's canvas using instance drawing attributes."""
+        self.draw_polygons([poly])
+
+    def draw_polygons(self, polys: List[Polygon]) -> None:
+        """Draw polygons as one path, setting the drawing attributes only once."""
+        self.draw_rings(exterior_coords(polys))
+
+    def draw_rings(self, rings: List[np.ndarray]) -> None:
+        """Draw (N_i, 2) SVG-unit coordinate rings as one path."""
         assert self.canvas is not None, "Canvas must be initialized before drawing."
-        pts = []
-        for x, y in poly.exterior.coords:
-            px = x / self.args.svg_units_per_in * inch
-            py = y / self.args.svg_units_per_in * inch
+        # Emit the path operators as text in one go instead of a moveTo/lineTo
+        # call per vertex; "n" starts the path just as beginPath() would.
+        code = ["n"] if rings else []
+        for ring in rings:
+            pts = ring / self.args.svg_units_per_in * inch
             if not self.args.flip_y:
-                py = self.args.page_height_in * inch - py
-            pts.append((px, py))
-        path = self.canvas.beginPath()
-        path.moveTo(*pts[0])
-        for pt in pts[1:]:
-            path.lineTo(*pt)
-        path.close()
+                pts[:, 1] = self.args.page_height_in * inch - pts[:, 1]
+            code.extend(_ring_path_code(pts))
+        path = PDFPathObject(code=code)
         if self.fill_color:
             self.canvas.setFillColor(self.fill_color, alpha=self.alpha)
         else:
@@ -133,27 +202,77 @@ class PDFPolygonWriter:
         """Draw a label on the canvas for the given polygon index."""
         assert self.canvas is not None, "Canvas must be initialized before drawing."
         orig_x, orig_y = self.args.label_positions[args.poly_idx]
-        pt = Point(orig_x, orig_y)
-        pt_rot = shapely_rotate(pt, args.rotation, origin=args.seam_poly.centroid)
-        pt_tr = shapely_translate(pt_rot, args.dx, args.dy)
-        lx = pt_tr.x / self.args.svg_units_per_in * inch
-        ly = pt_tr.y / self.args.svg_units_per_in * inch
+        origin = args.origin
+        if origin is None:
+            origin = args.seam_poly.centroid.coords[0]
+        a, b, d, e, xoff, yoff = rotation_matrix(
+            args.rotation, origin, args.dx, args.dy
+        )
+        x = a * orig_x + b * orig_y + xoff
+        y = d * orig_x + e * orig_y + yoff
+        self.draw_label_at(args.poly_idx, x, y)
+
+    def draw_label_at(self, poly_idx: int, x: float, y: float) -> None:
+        """Draw the label of `poly_idx` centered on already-transformed SVG coords."""
+        assert self.canvas is not None, "Canvas must be initialized before drawing."
+        lx = x / self.args.svg_units_per_in * inch
+        ly = y / self.args.svg_units_per_in * inch
         if not self.args.flip_y:
             ly = self.args.page_height_in * inch - ly
         self.canvas.setFont("Helvetica-Bold", self.args.label_fontsize)
         self.canvas.setFillColor(black)
-        offset = text_center_offset("Helvetica-Bold", self.args.label_fontsize)
-        self.canvas.drawCentredString(
-            lx, ly - offset, self.args.piece_labels[args.poly_idx]
-        )
-        if self.args.color_names and args.poly_idx in self.args.color_names:
+        offset = self._label_offset
+        self.canvas.drawCentredString(lx, ly - offset, self.args.piece_labels[poly_idx])
+        if self.args.color_names and poly_idx in self.args.color_names:
             self.canvas.setFont("Helvetica", self.args.label_fontsize * 0.5)
             self.canvas.drawCentredString(
                 lx,
                 ly - offset - self.args.label_fontsize * 0.75,
-                self.args.color_names[args.poly_idx],
+                self.args.color_names[poly_idx],
             )
 
+    def _placed_rings(
+        self, placement: Any
+    ) -> Tuple[List[np.ndarray], List[bool], List[int], np.ndarray]:
+        """Transform a placement's seam ring, piece rings and label points.
+
+        All rings go through one matrix multiply and one bounds reduction.
+
+        Returns:
+            ([seam ring, *piece rings], whether each ring touches the page,
+            piece indices, (n, 2) label points), all in page SVG units.
+        """
+        group_idx = placement.group_idx
+        group_poly_idxs = self.args.groups[group_idx]
+        polygon_coords = self.args.polygon_coords or []
+        # One matrix per placement, shared by its rings and labels.
+        matrix = rotation_matrix(
+            placement.rotation,
+            self._seam_centroids[group_idx],
+            placement.dx,
+            placement.dy,
+        )
+        rings = [
+            self._seam_coords[group_idx],
+            *(polygon_coords[pi] for pi in group_poly_idxs),
+        ]
+        starts = np.cumsum([0, *(len(ring) for ring in rings[:-1])])
+        moved = transform_points(np.concatenate(rings), matrix)
+        lo = np.minimum.reduceat(moved, starts)
+        hi = np.maximum.reduceat(moved, starts)
+        on_page = np.all(hi >= 0, axis=1) & np.all(lo <= self._page_extent, axis=1)
+        positions = np.array(
+            [self.args.label_positions[pi] for pi in group_poly_idxs],
+            dtype=float,
+        ).reshape(-1, 2)
+        points = transform_points(positions, matrix)
+        return (
+            np.split(moved, starts[1:]),
+            on_page.tolist(),
+            group_poly_idxs,
+            points,
+        )
+
     def write(self) -> None:
         """Write the polygons and labels to a PDF file."""
         self.canvas = rl_canvas.Canvas(
@@ -164,38 +283,39 @@ class PDFPolygonWriter:
             ),
         )
         for placements in self.args.pages:
+            # Placements never overlap, so each style is drawn as one batch:
+            # all seam allowances, then all pieces, then the labels on top.
+            seam_rings: List[np.ndarray] = []
+            piece_rings: List[np.ndarray] = []
+            label_idxs: List[int] = []
+            label_points: List[np.ndarray] = []
             for placement in placements:
-                group_idx = placement.group_idx
-                rotation = placement.rotation
-                dx = placement.dx
-                dy = placement.dy
-                seam_poly = self.args.seam_allowances[group_idx]
-                group_poly_idxs = self.args.groups[group_idx]
-                group_polys = [self.args.polygons[pi] for pi in group_poly_idxs]
-                group_polys_final, seam_poly_final = transform_group_shapes(
-                    group_polys, seam_poly, rotation, dx, dy
-                )
-                # Draw seam allowance with seam style
-                self.fill_color = self.gray
-                self.stroke_color = self.gray
-                self.alpha = 1.0
-                self.linewidth = 0
-                self.draw_polygon(seam_poly_final)
-                # Draw polygons and labels (transformed positions)
-                self.fill_color = self.light
-                self.stroke_color = black
-                self.alpha = 1.0
-                self.linewidth = 1
-                for poly, poly_idx in zip(group_polys_final, group_poly_idxs):
-                    self.draw_polygon(poly)
-                    label_args = LabelDrawArgs(
-                        poly_idx=poly_idx,
-                        rotation=rotation,
-                        dx=dx,
-                        dy=dy,
-                        seam_poly=seam_poly,
-                    )
-                    self.draw_label(label_args)
+                rings, on_page, poly_idxs, points = self._placed_rings(placement)
+                # Cull whatever lands entirely off the page.
+                if not on_page[0]:
+                    continue
+                seam_rings.append(rings[0])
+                for ring, visible, poly_idx, point in zip(
+                    rings[1:], on_page[1:], poly_idxs, points
+                ):
+                    if visible:
+                        piece_rings.append(ring)
+                        label_idxs.append(poly_idx)
+                        label_points.append(point)
+            # Draw seam allowances with seam style
+            self.fill_color = self.gray
+            self.stroke_color = self.gray
+            self.alpha = 1.0
+            self.linewidth = 0
+            self.draw_rings(seam_rings)
+            # Draw polygons and labels (transformed positions)
+            self.fill_color = self.light
+            self.stroke_color = black
+            self.alpha = 1.0
+            self.linewidth = 1
+            self.draw_rings(piece_rings)
+            for poly_idx, (x, y) in zip(label_idxs, np.array(label_points).tolist()):
+                self.draw_label_at(poly_idx, x, y)
             self.canvas.showPage()
         self.canvas.save()
         logger.info("PDF saved to %s", self.args.filename)
@@ -1,19 +1,30 @@
 """General utilities for coloring, plotting, SVG parsing, and polygon cleanup."""
 
+from __future__ import annotations
+
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 
-import matplotlib
-import matplotlib.pyplot as plt
+import numpy as np
+import shapely
+from matplotlib import font_manager
+from PIL import Image, ImageDraw, ImageFont  # type: ignore[import-untyped]
 from shapely.geometry import Polygon
 
-from utils import get_distinct_colors
-
-matplotlib.use("Agg")
+from utils import exterior_coords, get_distinct_colors
 
 logger = logging.getLogger(__name__)
 
+PAD_INCHES = 0.1
+# Fontconfig patterns, resolved to matplotlib's bundled DejaVu fonts.
+TITLE_FONT = "DejaVu Sans"
+TITLE_FONTSIZE = 12  # points
+LABEL_FONT = "DejaVu Sans:bold"
+POLYGON_ALPHA = 0.85
+LABEL_BOX_ALPHA = 0.7
+
 
 @dataclass
 class PolygonLayoutConfig:
@@ -25,6 +36,13 @@ class PolygonLayoutConfig:
     groups: Optional[List[List[int]]] = None
     polygon_colors: Optional[Dict[int, Tuple[int, int, int]]] = None
     figsize: Tuple[int, int] = (8, 10)
+    # (N_i, 2) exterior coordinates of each polygon, derived if not given.
+    polygon_coords: Optional[List[np.ndarray]] = None
+
+    def __post_init__(self) -> None:
+        """Extract the polygon coordinate arrays once, for all rendering."""
+        if self.polygon_coords is None:
+            self.polygon_coords = exterior_coords(self.polygons)
 
 
 @dataclass
@@ -34,6 +52,19 @@ class LayoutOutputConfig:
     out_png: str = "overall_layout.png"
     dpi: int = 300
     title: str = "FPP Pattern: All Pieces & Labels (Right side)"
+    # zlib level 0-9 for the PNG encoder; lower trades file size for speed.
+    compress_level: int = 6
+
+
+def label_fontsizes(polygons: List[Polygon]) -> np.ndarray:
+    """Return a label font size per polygon, scaled by its share of the max area.
+
+    Areas come from a single vectorized GEOS call instead of one per label.
+    """
+    areas = shapely.area(np.asarray(polygons, dtype=object))
+    max_area = areas.max() if len(areas) else 1.0
+    ratios = areas / max_area if max_area else np.ones_like(areas)
+    return np.maximum(5, 15 * np.sqrt(ratios))
 
 
 class PolygonLayoutPlotter:
@@ -69,48 +100,119 @@ class PolygonLayoutPlotter:
     def save_png(self, output_cfg: LayoutOutputConfig) -> None:
         """Render and save a PNG with all polygons and labels.
 
+        Polygons are rasterized straight into a Pillow image (SVG y-down maps
+        onto pixel rows), skipping matplotlib's figure and artist machinery.
+
         Args:
             output_cfg: LayoutOutputConfig with output filename, dpi, and title.
         """
-        plt.figure(figsize=self.layout_cfg.figsize, dpi=output_cfg.dpi)
-        ax = plt.gca()
-        poly_colors = self.get_polygon_colors()
+        dpi = output_cfg.dpi
+        width, height = (int(round(size * dpi)) for size in self.layout_cfg.figsize)
+        image = Image.new("RGB", (width, height), "white")
+        draw = ImageDraw.Draw(image, "RGBA")  # RGBA mode alpha-blends fills
+
+        pad = PAD_INCHES * dpi
+        title_font = _font(TITLE_FONT, _points_to_pixels(TITLE_FONTSIZE, dpi))
+        draw.text(
+            (width / 2, pad),
+            output_cfg.title,
+            fill="black",
+            font=title_font,
+            anchor="mt",
+        )
+        top = pad + 2 * _points_to_pixels(TITLE_FONTSIZE, dpi)
+        to_pixels = self._pixel_mapping(
+            (pad, top, width - pad, height - pad), self.layout_cfg.polygon_coords
+        )
 
-        for idx, poly in enumerate(self.layout_cfg.polygons):
-            color = poly_colors.get(idx, (0.7, 0.7, 0.95))
-            xs, ys = poly.exterior.xy
-            ax.fill(
-                xs, ys, color=color, alpha=0.85, linewidth=1, edgecolor="k", zorder=2
+        poly_colors = self.get_polygon_colors()
+        outline_width = max(1, round(_points_to_pixels(1, dpi)))
+        for idx, coords in enumerate(self.layout_cfg.polygon_coords or []):
+            rgb = poly_colors.get(idx, (0.7, 0.7, 0.95))
+            draw.polygon(
+                to_pixels(coords).ravel().tolist(),
+                fill=_rgba(rgb, POLYGON_ALPHA),
+                outline="black",
+                width=outline_width,
             )
 
-        max_area = max((poly.area for poly in self.layout_cfg.polygons), default=1.0)
+        fontsizes = label_fontsizes(self.layout_cfg.polygons)
         for idx, label in self.layout_cfg.piece_labels.items():
-            poly = self.layout_cfg.polygons[idx]
-            area_ratio = poly.area / max_area if max_area else 1.0
-            fontsize = max(5, 15 * area_ratio**0.5)
-            plt.text(
-                self.layout_cfg.label_positions[idx][0],
-                self.layout_cfg.label_positions[idx][1],
-                label,
-                ha="center",
-                va="center",
-                fontsize=fontsize,
-                fontweight="bold",
-                bbox={"facecolor": "white", "alpha": 0.7, "boxstyle": "round,pad=0.2"},
-                zorder=3,
+            size = _points_to_pixels(float(fontsizes[idx]), dpi)
+            font = _font(LABEL_FONT, size)
+            position = np.asarray(self.layout_cfg.label_positions[idx], dtype=float)
+            x, y = to_pixels(position.reshape(1, 2))[0].tolist()
+            left, upper, right, lower = draw.textbbox(
+                (x, y), label, font=font, anchor="mm"
+            )
+            box_pad = 0.2 * size
+            draw.rounded_rectangle(
+                (left - box_pad, upper - box_pad, right + box_pad, lower + box_pad),
+                radius=box_pad,
+                fill=_rgba((1.0, 1.0, 1.0), LABEL_BOX_ALPHA),
             )
+            draw.text((x, y), label, fill="black", font=font, anchor="mm")
 
-        plt.axis("equal")
-        plt.axis("off")
-        plt.title(output_cfg.title)
-        plt.tight_layout()
-        plt.gca().invert_yaxis()
-        plt.savefig(
-            output_cfg.out_png, bbox_inches="tight", pad_inches=0.1, dpi=output_cfg.dpi
+        image.save(
+            output_cfg.out_png,
+            dpi=(dpi, dpi),
+            compress_level=output_cfg.compress_level,
         )
-        plt.close()
         logger.info("PNG saved to %s", output_cfg.out_png)
 
+    @staticmethod
+    def _pixel_mapping(
+        area: Tuple[float, float, float, float],
+        coords: Optional[List[np.ndarray]],
+    ) -> Callable[[np.ndarray], np.ndarray]:
+        """Return a function fitting SVG points into `area`, keeping aspect ratio.
+
+        Args:
+            area: (left, top, right, bottom) pixel box to draw into.
+            coords: Polygon coordinate arrays defining the drawing extent.
+
+        Returns:
+            Function mapping an (n, 2) SVG point array to pixel coordinates.
+        """
+        left, top, right, bottom = area
+        if not coords:
+            return lambda points: points
+        points = np.concatenate(coords)
+        lo = points.min(axis=0)
+        span = np.maximum(points.max(axis=0) - lo, 1e-9)
+        scale = min((right - left) / span[0], (bottom - top) / span[1])
+        # Center the drawing within the area.
+        corner = (
+            np.array([left, top])
+            + (np.array([right - left, bottom - top]) - span * scale) / 2
+        )
+        return lambda pts: (pts - lo) * scale + corner
+
+
+def _points_to_pixels(points: float, dpi: int) -> float:
+    """Convert a typographic size in points to pixels at `dpi`."""
+    return points * dpi / 72
+
+
+def _rgba(rgb: Tuple[float, ...], alpha: float) -> Tuple[int, int, int, int]:
+    """Convert a [0, 1] RGB tuple and alpha to a Pillow RGBA tuple."""
+    r, g, b = (int(round(channel * 255)) for channel in rgb[:3])
+    return (r, g, b, int(round(alpha * 255)))
+
+
+@lru_cache(maxsize=None)
+def _font(pattern: str, size: float) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """Load a font at a pixel size, falling back to Pillow's default.
+
+    The fontconfig `pattern` is resolved through matplotlib, whose bundled
+    fonts are available on every platform, not only where they are installed.
+    """
+    path = font_manager.findfont(font_manager.FontProperties(pattern))
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
 
 def save_overall_layout_png(
     layout_cfg: PolygonLayoutConfig,
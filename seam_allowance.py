@@ -1,14 +1,20 @@
 """Generate seam allowance shapes for grouped FPP polygons.
 
-Buffer the union of grouped polygons to create seam allowance regions.
+Buffer the convex hull of each group's polygons to create seam allowance
+regions. `seam_allowance_polygons` builds all groups in batched calls; the
+single-group helpers (`group_polygons_to_shape`,
+`clean_and_buffer_group_shape`) remain for callers working one group at a
+time and produce the same shapes.
 """
 
 from typing import Dict, List, Union
 
+import numpy as np
+import shapely
 from shapely.geometry import MultiPolygon, Polygon
 from shapely.ops import unary_union
 
-from utils import remove_collinear_points
+from utils import remove_collinear_points, remove_collinear_points_batch
 
 
 def group_polygons_to_shape(
@@ -75,11 +81,27 @@ def seam_allowance_polygons(
 
     Returns:
         Dict {group_index: buffered shape (Polygon or MultiPolygon)}.
+
+    Raises:
+        ValueError: If a group is empty or its convex hull is not a Polygon.
     """
     allowance = allowance_in_inches * svg_units_per_inch
-    result: Dict[int, Union[Polygon, MultiPolygon]] = {}
-    for i, group in enumerate(groups):
-        shape = group_polygons_to_shape(polygons, group)
-        seam_shape = clean_and_buffer_group_shape(shape, allowance)
-        result[i] = seam_shape
-    return result
+    if not groups:
+        return {}
+    if not all(groups):
+        raise ValueError("Cannot build a seam allowance for an empty group.")
+    # The hull of a group's union equals the hull of its member polygons, so
+    # each group becomes a plain collection and every stage runs as one
+    # vectorized GEOS call across all groups.
+    members = np.concatenate([np.asarray(group, dtype=int) for group in groups])
+    group_ids = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+    collections = shapely.geometrycollections(
+        np.asarray(polygons, dtype=object)[members], indices=group_ids
+    )
+    hulls = shapely.convex_hull(collections)
+    for hull in hulls:
+        if not isinstance(hull, Polygon):
+            raise ValueError(f"Convex hull is not a Polygon (got {type(hull)})")
+    simple = remove_collinear_points_batch(list(hulls))
+    buffered = shapely.buffer(simple, allowance, join_style="mitre")  # Flat corners
+    return dict(enumerate(buffered))
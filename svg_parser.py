@@ -5,31 +5,213 @@ SVG file, returning them as Shapely LineString objects for geometric
 operations or further processing.
 """
 
-from typing import List
+import os
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+import shapely
 from shapely.geometry import LineString
-from svgpathtools import Line, svg2paths2  # type: ignore[import-untyped]
+from svgpathtools import Line, parse_path  # type: ignore[import-untyped]
+from svgpathtools.path import (  # type: ignore[import-untyped]
+    COMMAND_RE,
+    COMMANDS,
+    FLOAT_RE,
+    UPPERCASE,
+)
+from svgpathtools.svg_to_paths import (  # type: ignore[import-untyped]
+    polygon2pathd,
+    polyline2pathd,
+    rect2pathd,
+)
 
 
-def parse_svg(svg_filename: str) -> List[LineString]:
+def _line2pathd(attrs: Dict[str, str]) -> str:
+    """Convert an SVG <line> element's attributes to a path string."""
+    return "M" + attrs["x1"] + " " + attrs["y1"] + "L" + attrs["x2"] + " " + attrs["y2"]
+
+
+# Elements that can contribute straight segments, in the order svg2paths reads
+# them (all paths first, then polylines, ...). Circles and ellipses only ever
+# produce arcs, so they are skipped.
+_PATH_D_BUILDERS = (
+    ("path", lambda attrs: attrs["d"]),
+    ("polyline", polyline2pathd),
+    ("polygon", lambda attrs: polygon2pathd(attrs, True)),
+    ("line", _line2pathd),
+    ("rect", rect2pathd),
+)
+
+
+# Commands whose segments are curves; paths using them go through svgpathtools.
+_CURVE_COMMANDS = frozenset("CcSsQqTtAa")
+# Coordinates consumed by each straight-line command.
+_NUM_ARGS = {"M": 2, "L": 2, "H": 1, "V": 1, "Z": 0}
+
+
+def _straight_segments(d: str) -> Optional[List[Tuple[complex, complex]]]:
+    """Return (start, end) points of a path made only of M/L/H/V/Z commands.
+
+    Follows svgpathtools' parser step for step, including its complex-number
+    arithmetic, so the endpoints are identical to its `Line` segments, but
+    builds no `Path`/`Line` objects.
+
+    Args:
+        d: SVG path data string.
+
+    Returns:
+        Segment endpoints, or None if the path has curves or is malformed and
+        should be left to svgpathtools.
+    """
+    if not _CURVE_COMMANDS.isdisjoint(d):
+        return None
+    tokens: List[str] = []
+    for part in COMMAND_RE.split(d):
+        if part in COMMANDS:
+            tokens.append(part)
+        else:
+            tokens.extend(FLOAT_RE.findall(part))
+    segments: List[Tuple[complex, complex]] = []
+    current, start = 0j, None
+    command, absolute = None, True
+    i = 0
+    while i < len(tokens):
+        if tokens[i] in COMMANDS:
+            absolute = tokens[i] in UPPERCASE
+            command = tokens[i].upper()
+            i += 1
+        if command is None:
+            return None
+        args = tokens[i : i + _NUM_ARGS[command]]
+        if len(args) < _NUM_ARGS[command] or not COMMANDS.isdisjoint(args):
+            return None
+        i += len(args)
+        if command == "M":
+            pos = float(args[0]) + float(args[1]) * 1j
+            current = pos if absolute else current + pos
+            start = current
+            command = "L"  # Further coordinate pairs are implicit linetos
+            continue
+        if command == "Z":
+            if start is None:
+                return None
+            if current != start:
+                segments.append((current, start))
+            current = start
+            command = None
+            continue
+        if command == "L":
+            pos = float(args[0]) + float(args[1]) * 1j
+            if not absolute:
+                pos += current
+        elif command == "H":
+            pos = float(args[0]) + current.imag * 1j
+            if not absolute:
+                pos += current.real
+        else:  # "V"
+            pos = current.real + float(args[0]) * 1j
+            if not absolute:
+                pos += current.imag * 1j
+        segments.append((current, pos))
+        current = pos
+    return segments
+
+
+def _unique_segments(coords: np.ndarray) -> np.ndarray:
+    """Drop repeated segments from an (N, 2, 2) array, in either direction.
+
+    Shared edges drawn once per neighboring shape would otherwise show up as
+    parallel duplicate seams. First occurrences are kept, in their original
+    order and direction.
+    """
+    start, end = coords[:, 0], coords[:, 1]
+    flip = (start[:, 0] > end[:, 0]) | (
+        (start[:, 0] == end[:, 0]) & (start[:, 1] > end[:, 1])
+    )
+    canonical = np.where(flip[:, None, None], coords[:, ::-1], coords)
+    # Adding 0.0 folds -0.0 into 0.0 so both compare equal below.
+    _, first = np.unique(canonical.reshape(-1, 4) + 0.0, axis=0, return_index=True)
+    return coords[np.sort(first)]
+
+
+def _local_name(tag: str) -> str:
+    """Strip an ElementTree ``{namespace}`` prefix from a tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_svg(
+    svg_filename: str, tree: Optional[ET.ElementTree] = None
+) -> List[LineString]:
     """Parse an SVG file and return a list of Shapely LineString objects.
 
     Args:
         svg_filename (str): Path to the SVG file.
+        tree (Optional[ET.ElementTree]): Already-parsed tree of the same file,
+            to avoid reading and parsing it again.
 
     Returns:
         List[LineString]: Shapely LineString objects representing
             SVG line segments.
     """
-    paths, _, _ = svg2paths2(svg_filename)
-    return [
-        LineString(
-            [
-                (segment.start.real, segment.start.imag),
-                (segment.end.real, segment.end.imag),
-            ]
-        )
-        for path in paths
-        for segment in path
-        if isinstance(segment, Line)
-    ]
+    if tree is not None:
+        return list(_tree_line_strings(tree))
+    # Re-parsing an unchanged file is served from the cache; the stat
+    # signature invalidates it when the file is edited.
+    stat = os.stat(svg_filename)
+    return list(_parse_svg_cached(svg_filename, stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=32)
+def _parse_svg_cached(
+    svg_filename: str, mtime_ns: int, size: int
+) -> Tuple[LineString, ...]:
+    """Parse an SVG file, memoized on its path and stat signature."""
+    del mtime_ns, size  # Only part of the cache key
+    return _tree_line_strings(ET.parse(svg_filename))
+
+
+def clear_svg_cache() -> None:
+    """Forget all cached `parse_svg` results."""
+    _parse_svg_cached.cache_clear()
+
+
+def _tree_line_strings(tree: ET.ElementTree) -> Tuple[LineString, ...]:
+    """Extract the straight segments of a parsed SVG tree as LineStrings.
+
+    Elements are matched by local name, so namespace-prefixed shapes such as
+    ``<svg:path>`` are included. svg2paths2 matched the literal tag name and
+    skipped them, although SVG renderers draw them.
+    """
+    elements: Dict[str, List[Dict[str, str]]] = {
+        name: [] for name, _ in _PATH_D_BUILDERS
+    }
+    for elem in tree.getroot().iter():
+        if not isinstance(elem.tag, str):
+            continue  # Comments and processing instructions
+        name = _local_name(elem.tag)
+        if name in elements:
+            elements[name].append(dict(elem.attrib))
+    segments: List[Tuple[complex, complex]] = []
+    for name, to_d in _PATH_D_BUILDERS:
+        for attrs in elements[name]:
+            d = to_d(attrs)
+            straight = _straight_segments(d)
+            if straight is None:
+                straight = [
+                    (segment.start, segment.end)
+                    for segment in parse_path(d)
+                    if isinstance(segment, Line)
+                ]
+            segments.extend(straight)
+    # A complex128 is stored as (real, imag) doubles, so viewing the flat
+    # endpoint array as float64 gives the (N, 2, 2) coordinates without
+    # touching .real/.imag per point. All LineStrings are then built with a
+    # single vectorized constructor call.
+    endpoints = np.fromiter(
+        chain.from_iterable(segments), dtype=np.complex128, count=2 * len(segments)
+    )
+    coords = _unique_segments(endpoints.view(np.float64).reshape(-1, 2, 2))
+    # Shapely geometries are immutable, so cached results can be shared.
+    return tuple(shapely.linestrings(coords))
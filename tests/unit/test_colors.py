@@ -2,17 +2,23 @@ import base64
 import io
 import xml.etree.ElementTree as ET
 
+import numpy as np
 import pytest
+import webcolors
 from PIL import Image
 from shapely.geometry import Polygon
 
 from colors import (
     extract_image_from_svg,
     svg_to_img_coords,
+    svg_to_img_coords_batch,
     average_color,
     closest_color_name,
+    closest_color_names,
     sample_polygon_color,
     polygon_color_map,
+    _XKCD_NAMES,
+    _XKCD_RGB,
 )
 
 
@@ -71,6 +77,15 @@ def test_svg_to_img_coords_scaled():
     assert (px, py) == (20, 10)
 
 
+def test_svg_to_img_coords_batch_matches_scalar():
+    xs = np.array([0.0, 2.5, 10.0, 13.7])
+    ys = np.array([1.0, 3.5, 5.0, -2.2])
+    args = ((1, 2), (20, 10), (40, 20))
+    px, py = svg_to_img_coords_batch(xs, ys, *args)
+    expected = [svg_to_img_coords(x, y, *args) for x, y in zip(xs, ys)]
+    assert list(zip(px.tolist(), py.tolist())) == expected
+
+
 def test_average_color_simple():
     img = Image.new("RGB", (10, 10), (123, 45, 67))
     poly = Polygon([(2, 2), (8, 2), (8, 8), (2, 8)])
@@ -78,6 +93,18 @@ def test_average_color_simple():
     assert rgb == (123, 45, 67)
 
 
+def test_average_color_window_mean_and_array_input():
+    img = Image.new("RGB", (4, 4), (0, 0, 0))
+    img.paste((100, 50, 10), (2, 0, 4, 4))  # right half colored
+    poly = Polygon([(1, 1), (3, 1), (3, 3), (1, 3)])  # centroid (2, 2)
+    rgb = average_color(poly, img, offset=(0, 0), svg_size=(4, 4), radius=1)
+    assert rgb == (66, 33, 6)  # 6 of 9 sampled pixels colored, floored
+    arr_rgb = average_color(
+        poly, np.asarray(img), offset=(0, 0), svg_size=(4, 4), radius=1
+    )
+    assert arr_rgb == rgb
+
+
 def test_average_color_out_of_bounds():
     img = Image.new("RGB", (4, 4), (1, 2, 3))
     # centroid is outside image bounds
@@ -114,12 +141,45 @@ def test_polygon_color_map_multiple_polys():
     assert rgb_map[1] == (100, 100, 0)
     assert name_map[0] == name_map[1]
 
+
+def test_polygon_color_map_keeps_empty_polygon_aligned():
+    img = Image.new("RGB", (5, 5), (100, 100, 0))
+    tree = ET.ElementTree(ET.fromstring(_make_svg_with_png(img, width=5, height=5)))
+    polys = [Polygon(), Polygon([(1, 1), (2, 1), (2, 2), (1, 2)])]
+    rgb_map, name_map = polygon_color_map(polys, tree)
+    assert rgb_map == {0: (0, 0, 0), 1: (100, 100, 0)}
+    assert set(name_map) == {0, 1}
+
+
 def test_closest_color_name_fallback():
     # Use a color unlikely to match exactly to trigger the fallback path
     name = closest_color_name((1, 2, 3))
     assert isinstance(name, str) and len(name) > 0
 
 
+def test_closest_color_names_matches_single_lookup():
+    rgbs = [(0, 0, 255), (1, 2, 3), (200, 120, 40)]
+    assert closest_color_names(rgbs) == [closest_color_name(c) for c in rgbs]
+    assert closest_color_names([]) == []
+
+
+def test_closest_color_names_matches_brute_force():
+    rng = np.random.default_rng(0)
+    rgbs = [tuple(int(c) for c in row) for row in rng.integers(0, 256, (500, 3))]
+    # Midpoints of palette pairs are equidistant from both ends, forcing ties.
+    pairs = rng.integers(0, len(_XKCD_RGB), (500, 2))
+    mids = (_XKCD_RGB[pairs[:, 0]] + _XKCD_RGB[pairs[:, 1]]) // 2
+    rgbs += [tuple(int(c) for c in row) for row in mids]
+    expected = []
+    for rgb in rgbs:
+        try:
+            expected.append(webcolors.rgb_to_name(rgb))
+        except ValueError:
+            sq_dists = ((_XKCD_RGB - np.array(rgb)) ** 2).sum(axis=1)
+            expected.append(_XKCD_NAMES[int(np.argmin(sq_dists))])
+    assert closest_color_names(rgbs) == expected
+
+
 def test_extract_image_from_svg_empty_tree():
     # ElementTree with no root should raise a ValueError
     tree = ET.ElementTree()
@@ -1,4 +1,6 @@
+import numpy as np
 import pytest
+import shapely
 from shapely.geometry import LineString, Polygon
 from geometry import lines_to_polygons
 
@@ -36,20 +38,13 @@ def test_lines_to_polygons_ignores_small_area():
 
 
 def test_lines_to_polygons_multiple_polygons():
-    square1 = [
-        LineString([(0, 0), (1, 0)]),
-        LineString([(1, 0), (1, 1)]),
-        LineString([(1, 1), (0, 1)]),
-        LineString([(0, 1), (0, 0)]),
-    ]
-    square2 = [
-        LineString([(2, 2), (3, 2)]),
-        LineString([(3, 2), (3, 3)]),
-        LineString([(3, 3), (2, 3)]),
-        LineString([(2, 3), (2, 2)]),
-    ]
+    unit_square = np.array([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)], dtype=float)
+    corners = np.stack([unit_square, unit_square + 2])
+    # (2 squares x 4 edges, 2 points, 2 coords), built in one call
+    edges = np.stack([corners[:, :-1], corners[:, 1:]], axis=2).reshape(-1, 2, 2)
+    lines = list(shapely.linestrings(edges))
 
-    polygons = lines_to_polygons(square1 + square2)
+    polygons = lines_to_polygons(lines)
 
     assert len(polygons) == 2
     areas = sorted([poly.area for poly in polygons])
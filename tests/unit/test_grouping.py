@@ -1,13 +1,20 @@
+import numpy as np
 import pytest
+import shapely
 from shapely.geometry import Polygon, LineString
 from grouping import (
+    PolyCache,
     build_polygon_adjacency,
+    build_vertex_adjacency,
     classify_seams,
+    coords_equal,
     find_exact_full_shared_edge,
     group_polygons,
     grow_group_from_seed,
     is_concave,
     polygon_area,
+    polygon_edge_keys,
+    polygon_edges,
     polygon_max_seam_order,
     polygons_are_adjacent,
     seam_is_collinear_with_bbox_edge,
@@ -31,10 +38,10 @@ def test_polygons_are_adjacent_true_and_false():
 
 
 def test_build_polygon_adjacency():
-    p1 = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
-    p2 = Polygon([(1, 0), (2, 0), (2, 1), (1, 1)])
-    p3 = Polygon([(2, 0), (3, 0), (3, 1), (2, 1)])
-    polygons = [p1, p2, p3]
+    # Three unit squares in a row, built with one batched constructor call
+    unit_square = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=float)
+    shifts = np.array([[0, 0], [1, 0], [2, 0]], dtype=float)
+    polygons = list(shapely.polygons(unit_square + shifts[:, None, :]))
 
     adjacency = build_polygon_adjacency(polygons)
     assert adjacency == {
@@ -44,6 +51,16 @@ def test_build_polygon_adjacency():
     }
 
 
+def test_build_vertex_adjacency():
+    p1 = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    p2 = Polygon([(1, 0), (2, 0), (2, 1), (1, 1)])
+    p3 = Polygon([(2, 0), (3, 0), (3, 1), (2, 1)])
+    p4 = Polygon([(0.5, 1), (1.5, 1), (1, 2)])  # Touches p1/p2 mid-edge only
+    rings = [np.asarray(p.exterior.coords) for p in (p1, p2, p3, p4)]
+
+    assert build_vertex_adjacency(rings) == {0: {1}, 1: {0, 2}, 2: {1}, 3: set()}
+
+
 def test_find_exact_full_shared_edge_true_and_false():
     p1 = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
     p2 = Polygon([(1, 0), (2, 0), (2, 1), (1, 1)])  # Shares one edge
@@ -53,6 +70,51 @@ def test_find_exact_full_shared_edge_true_and_false():
     assert not find_exact_full_shared_edge(p1, p3)
 
 
+def test_polycache_edges_match_polygon_edges():
+    p1 = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    p2 = Polygon([(1, 0), (2, 0), (2, 1), (1, 1)])
+    cache = PolyCache.from_polygon(p1)
+    assert cache.area == 1.0
+    assert cache.edges.shape == (4, 2, 2)
+    assert (cache.edges == polygon_edges(p1)).all()
+    assert polygon_edges(cache.edges) is cache.edges
+    assert find_exact_full_shared_edge(cache.edges, p2)
+    assert find_exact_full_shared_edge(cache.edge_keys, p2, tol=1e-2)
+
+
+def test_polycache_from_polygons_matches_single():
+    polygons = [
+        Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]),
+        Polygon([(0, 0), (0, 2), (3, 0)]),  # Clockwise, negative signed area
+    ]
+    for batch, poly in zip(PolyCache.from_polygons(polygons), polygons):
+        single = PolyCache.from_polygon(poly)
+        assert (batch.coords == single.coords).all()
+        assert batch.edge_keys == single.edge_keys
+        assert batch.area == single.area
+
+
+def test_polycache_from_polygons_keeps_empty_polygon_aligned():
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    empty, batch = PolyCache.from_polygons([Polygon(), square])
+    assert empty.coords.shape == (0, 2) and not empty.edge_keys
+    assert (batch.coords == PolyCache.from_polygon(square).coords).all()
+
+
+def test_polygon_edge_keys_ignore_direction():
+    ccw = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    cw = Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])
+    keys = polygon_edge_keys(ccw, tol=0.1)
+    assert len(keys) == 4
+    assert keys == polygon_edge_keys(cw, tol=0.1)
+    assert (0, 0, 10, 0) in keys
+
+
+def test_coords_equal_uses_absolute_tolerance():
+    assert coords_equal((1000.0, 5.0), (1000.005, 5.0), 1e-2)
+    assert not coords_equal((1000.0, 5.0), (1000.02, 5.0), 1e-2)
+
+
 def test_is_concave_identifies_concave_shapes():
     convex = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
     concave = Polygon([(0, 0), (2, 0), (1, 1), (2, 2), (0, 2)])  # Has inward dent
@@ -69,17 +131,14 @@ def test_group_polygons_basic_merge():
     polygons = [square3, square1, square2]  # Intentionally shuffled
 
     # Collect all unique edges as lines
-    def polygon_edges(poly):
-        coords = list(poly.exterior.coords)
-        return [LineString([coords[i], coords[i + 1]]) for i in range(len(coords) - 1)]
-
     edge_set = set()
     for poly in polygons:
-        for edge in polygon_edges(poly):
+        for edge in polygon_edges(poly).tolist():
             # Use tuple for hashability, directionless
-            key = tuple(sorted(edge.coords))
+            key = tuple(sorted(map(tuple, edge)))
             edge_set.add(key)
-    lines = [LineString(edge) for edge in edge_set]
+    coords = np.array(sorted(edge_set), dtype=np.float64).reshape(-1, 2, 2)
+    lines = list(shapely.linestrings(coords))
 
     groups = group_polygons(polygons, lines)
     assert len(groups) == 1
@@ -1,3 +1,5 @@
+import math
+
 import pytest
 from shapely.geometry import Polygon
 from labeling import int_to_label, label_groups, get_label_positions, label_polygons
@@ -40,6 +42,14 @@ def test_get_label_positions():
     assert pytest.approx(result[1][1]) == pytest.approx(2.6666666666666665)
 
 
+def test_get_label_positions_keeps_indices_aligned_past_empty_polygon():
+    polygons = [Polygon(), Polygon([(0, 0), (2, 0), (2, 2), (0, 2)])]
+    result = get_label_positions(polygons)
+    assert set(result) == {0, 1}
+    assert all(math.isnan(c) for c in result[0])
+    assert result[1] == (1.0, 1.0)
+
+
 def test_label_polygons_combined():
     polygons = [
         Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]),
@@ -1,5 +1,7 @@
 import math
 import pytest
+import numpy as np
+from shapely.affinity import affine_transform, rotate
 from shapely.geometry import Polygon, box, LineString, MultiPoint
 
 from layout import (
@@ -9,6 +11,11 @@ from layout import (
     PageLayoutEngine,
     Placement,
     _as_polygon,
+    rotation_matrix,
+    bounds_area,
+    placements_bounds,
+    score_placements,
+    translated_copies,
 )
 
 
@@ -86,6 +93,19 @@ def test_pagelayoutengine_prepare_packing_inputs_public():
     assert isinstance(angle, int)
 
 
+def test_prepare_packing_inputs_simplifies_finely_sampled_curves():
+    circle = Polygon(
+        [
+            (100 * math.cos(2 * math.pi * i / 256), 100 * math.sin(2 * math.pi * i / 256))
+            for i in range(256)
+        ]
+    )
+    engine = PageLayoutEngine({0: circle}, LayoutConfig(8.5, 11))
+    _, poly, _ = engine.prepare_packing_inputs()[0]
+    assert len(poly.exterior.coords) < 128
+    assert poly.contains(circle)
+
+
 def test_layout_groups_handles_multiple_pages():
     # 20 small shapes, packed tightly so 8.5x11 cannot hold them all.
     seam_allowances = {i: make_square(size=6) for i in range(20)}
@@ -126,6 +146,26 @@ def test_minimal_bounding_box_rotation_is_rotation_invariant_for_regular_polygon
     assert pytest.approx(rotated_poly.area) == pytest.approx(pentagon.area)
     assert 0 <= angle < 180
 
+def test_rotation_matrix_matches_shapely_rotate():
+    poly = Polygon([(0, 0), (3, 0), (1, 2)])
+    origin = poly.centroid.coords[0]
+    for angle in (0, 35, 90, 180):
+        expected = rotate(poly, angle, origin="centroid")
+        assert affine_transform(poly, rotation_matrix(angle, origin)).equals_exact(
+            expected, 0
+        )
+
+
+def test_score_placements_is_bounding_box_area():
+    placements = [
+        Placement(0, 0, 0.0, 0.0, make_square()),
+        Placement(1, 0, 2.0, 0.0, make_square(x=2, y=1)),
+    ]
+    assert placements_bounds(placements) == (0.0, 0.0, 3.0, 2.0)
+    assert score_placements(placements) == pytest.approx(6.0)
+    assert bounds_area((1.0, 1.0, 2.0, 4.0)) == pytest.approx(3.0)
+
+
 def test_as_polygon_raises_typeerror():
     with pytest.raises(TypeError):
         _as_polygon(LineString([(0,0),(1,1)]))
@@ -142,3 +182,69 @@ def test_place_next_handles_no_line_intersection(monkeypatch):
 
     res = engine._place_next(1, square, 0, [first])
     assert res is None
+
+
+def test_rotated_fit_is_cached_per_group_and_angle():
+    square = make_square()
+    engine = PageLayoutEngine({0: square}, LayoutConfig(8.5, 11))
+    rotated, ifp = engine._rotated_fit(0, square, 45)
+    assert isinstance(ifp, Polygon)
+    assert engine._rotated_fit(0, square, 45)[0] is rotated
+
+
+def test_place_first_rotates_piece_that_only_fits_sideways():
+    rect = box(0, 0, 700, 100)
+    engine = PageLayoutEngine({0: rect}, LayoutConfig(8.5, 11))
+    placement = engine._place_first(0, rect, 0)
+    assert placement.rotation == 90
+    assert engine.box.buffer(1e-6).contains(placement.poly)
+
+
+def test_minimal_bounding_box_rotation_keeps_axis_aligned_rectangle():
+    rect = box(0, 0, 3, 1)
+    rotated_poly, angle = minimal_bounding_box_rotation(rect)
+    assert angle == 0
+    assert rotated_poly.equals(rect)
+
+
+def test_minimal_bounding_box_rotation_leaves_degenerate_polygon():
+    sliver = Polygon([(0, 0), (1, 1), (2, 2)])
+    rotated_poly, angle = minimal_bounding_box_rotation(sliver)
+    assert angle == 0
+    assert rotated_poly is sliver
+
+
+def test_minimal_bounding_box_rotation_warns_on_legacy_step():
+    square = make_square()
+    with pytest.deprecated_call():
+        assert minimal_bounding_box_rotation(square, step=5) == (square, 0)
+
+
+def test_minimal_bounding_box_rotation_aligns_tilted_rectangle():
+    tilted = affine_transform(box(0, 0, 4, 1), rotation_matrix(-32, (2, 0.5)))
+    rotated_poly, angle = minimal_bounding_box_rotation(tilted)
+    assert angle % 90 == 32
+    assert rotated_poly.envelope.area == pytest.approx(4.0)
+
+
+def test_translated_copies_matches_shapely_translate():
+    from shapely.affinity import translate
+    tri = Polygon([(0, 0), (3, 0), (1, 2)])
+    offsets = np.array([[1.5, -2.0], [0.0, 0.0], [-7.25, 3.0]])
+    copies = translated_copies(tri, offsets)
+    assert len(copies) == 3
+    for (dx, dy), copy in zip(offsets, copies):
+        assert copy.equals_exact(translate(tri, xoff=dx, yoff=dy), 0)
+    # The source geometry is left untouched
+    assert tri.equals_exact(Polygon([(0, 0), (3, 0), (1, 2)]), 0)
+
+
+def test_prepare_packing_inputs_orders_by_area_keeping_ties_stable():
+    seams = {
+        7: make_square(size=10),
+        3: make_square(size=30),
+        5: make_square(x=50, size=10),
+    }
+    engine = PageLayoutEngine(seams, LayoutConfig(8.5, 11))
+    assert [idx for idx, _, _ in engine.prepare_packing_inputs()] == [3, 7, 5]
+    assert PageLayoutEngine({}, LayoutConfig(8.5, 11)).prepare_packing_inputs() == []
@@ -1,11 +1,13 @@
 import io
 
+import numpy as np
 import pytest
 from reportlab.pdfgen import canvas as rl_canvas
 from shapely.geometry import Polygon
 
 from layout import Placement
 from pdf_writer import (
+    _ring_path_code,
     LabelDrawArgs,
     PDFPolygonWriter,
     PDFWriterArgs,
@@ -13,7 +15,9 @@ from pdf_writer import (
     pdf_writer,
     text_center_offset,
     transform_group_shapes,
+    transform_points,
 )
+from utils import rotation_matrix
 
 
 def test_text_center_offset_returns_float():
@@ -39,6 +43,14 @@ def test_transform_group_shapes_applies_rotation_and_translation():
     assert out_seam.centroid.y == pytest.approx(seam.centroid.y + dy, rel=1e-3)
 
 
+def test_transform_points_matches_transform_group_shapes():
+    seam = Polygon([(0, 0), (4, 0), (4, 2), (0, 2)])
+    matrix = rotation_matrix(90, seam.centroid.coords[0], 3, -1)
+    _, out_seam = transform_group_shapes([], seam, 90, 3, -1)
+    points = transform_points(np.array(seam.exterior.coords), matrix)
+    assert np.allclose(points, np.array(out_seam.exterior.coords))
+
+
 def test_apply_transform_rotation_and_translation():
     poly = Polygon([(0, 0), (2, 0), (2, 2), (0, 2)])
     rot = 180
@@ -55,6 +67,34 @@ def test_apply_transform_rotation_and_translation():
     assert isinstance(new_cy, float)
 
 
+def test_apply_transform_identity_and_pure_shift():
+    poly = Polygon([(0, 0), (2, 0), (2, 1)])
+    assert apply_transform(poly) is poly
+    assert apply_transform(poly, rotation=360) is poly
+    shifted = apply_transform(poly, rotation=-360, dx=1, dy=2)
+    assert shifted.equals_exact(Polygon([(1, 2), (3, 2), (3, 3)]), 1e-12)
+
+
+def test_apply_transform_zero_rotation_shift_skips_centroid(monkeypatch):
+    poly = Polygon([(0, 0), (2, 0), (2, 1)])
+
+    def no_centroid(self):
+        raise AssertionError("centroid looked up for a pure shift")
+
+    monkeypatch.setattr(Polygon, "centroid", property(no_centroid))
+    shifted = apply_transform(poly, rotation=0, dx=1, dy=2)
+    assert shifted.equals_exact(Polygon([(1, 2), (3, 2), (3, 3)]), 1e-12)
+
+
+def test_apply_transform_rotation_without_shift_turns_about_centroid():
+    poly = Polygon([(0, 0), (4, 0), (4, 2), (0, 2)])
+    turned = apply_transform(poly, rotation=90, dx=0, dy=0)
+    assert turned is not poly
+    assert turned.centroid.equals_exact(poly.centroid, 1e-9)
+    minx, miny, maxx, maxy = turned.bounds
+    assert (maxx - minx, maxy - miny) == pytest.approx((2, 4))
+
+
 def test_pdfwriterargs_fields():
     args = PDFWriterArgs(
         filename="out.pdf",
@@ -102,6 +142,16 @@ def test_draw_polygon_no_fill(tmp_path):
     writer.draw_polygon(poly)
 
 
+def test_draw_polygons_emits_one_path(tmp_path):
+    writer = _make_writer(tmp_path)
+    writer.fill_color = writer.light
+    squares = [Polygon([(x, 0), (x + 1, 0), (x + 1, 1), (x, 1)]) for x in (0, 2)]
+    writer.draw_polygons(squares)
+    ops = " ".join(writer.canvas._code).split()
+    assert ops.count("m") == 2
+    assert ops.count("B*") == 1
+
+
 def test_draw_label_with_color(tmp_path):
     writer = _make_writer(tmp_path)
     poly = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
@@ -153,3 +203,58 @@ def test_pdfpolygonwriter_write_no_flip(tmp_path):
     writer = PDFPolygonWriter(args)
     writer.write()
     assert (tmp_path / "out.pdf").is_file()
+
+
+def test_ring_path_code_matches_reportlab_path():
+    pts = np.array([[0.0, 0.0], [12.5, 0.0], [12.5, 7.25]])
+    path = rl_canvas.Canvas(io.BytesIO()).beginPath()
+    path.moveTo(0.0, 0.0)
+    path.lineTo(12.5, 0.0)
+    path.lineTo(12.5, 7.25)
+    path.close()
+    assert " ".join(["n", *_ring_path_code(pts)]) == path.getCode()
+
+
+def test_write_culls_off_page_placements(tmp_path, monkeypatch):
+    square = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)])
+    seam = square.buffer(1, join_style="mitre")
+    args = PDFWriterArgs(
+        filename=str(tmp_path / "out.pdf"),
+        pages=[
+            [
+                Placement(group_idx=0, rotation=0, dx=20, dy=20, poly=seam),
+                Placement(group_idx=1, rotation=0, dx=5000, dy=20, poly=seam),
+            ]
+        ],
+        seam_allowances={0: seam, 1: seam},
+        polygons=[square, square],
+        groups=[[0], [1]],
+        piece_labels={0: "A1", 1: "B1"},
+        label_positions={0: (5, 5), 1: (5, 5)},
+    )
+    writer = PDFPolygonWriter(args)
+    drawn = []
+    labels = []
+    monkeypatch.setattr(writer, "draw_rings", lambda rings: drawn.append(len(rings)))
+    monkeypatch.setattr(
+        writer, "draw_label_at", lambda poly_idx, x, y: labels.append(poly_idx)
+    )
+    writer.write()
+    assert drawn == [1, 1]
+    assert labels == [0]
+
+
+def test_pdfwriterargs_render_simplify_tol_drops_near_collinear_vertices():
+    jagged = Polygon([(0, 0), (5, 0.01), (10, 0), (10, 10), (0, 10)])
+    kwargs = dict(
+        filename="out.pdf",
+        pages=[],
+        seam_allowances={},
+        polygons=[jagged],
+        groups=[[0]],
+        piece_labels={},
+        label_positions={},
+    )
+    assert len(PDFWriterArgs(**kwargs).polygon_coords[0]) == 6
+    simplified = PDFWriterArgs(**kwargs, render_simplify_tol=0.5)
+    assert len(simplified.polygon_coords[0]) == 5
@@ -8,6 +8,10 @@ from png_writer import (
     PolygonLayoutConfig,
     LayoutOutputConfig,
     PolygonLayoutPlotter,
+    LABEL_FONT,
+    TITLE_FONT,
+    _font,
+    label_fontsizes,
     save_overall_layout_png,
 )
 
@@ -33,11 +37,29 @@ def test_polygonlayoutconfig_fields():
     assert config.figsize == (8, 10)
 
 
+def test_polygonlayoutconfig_precomputes_coords():
+    polys, labels, positions = simple_polygons()
+    config = PolygonLayoutConfig(polys, labels, positions)
+    assert len(config.polygon_coords) == len(polys)
+    assert config.polygon_coords[1].shape == (4, 2)
+    assert config.polygon_coords[1][0].tolist() == [2.0, 0.0]
+
+
+def test_label_fontsizes_scale_with_area():
+    polys = [
+        Polygon([(0, 0), (10, 0), (10, 10), (0, 10)]),
+        Polygon([(0, 0), (5, 0), (5, 5), (0, 5)]),
+        Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]),
+    ]
+    assert label_fontsizes(polys).tolist() == [15.0, 7.5, 5.0]
+
+
 def test_layoutoutputconfig_defaults():
     out_cfg = LayoutOutputConfig()
     assert out_cfg.out_png == "overall_layout.png"
     assert out_cfg.dpi == 300
     assert out_cfg.title.startswith("FPP Pattern")
+    assert out_cfg.compress_level == 6
 
 
 def test_polygonlayoutplotter_color_assignment():
@@ -77,3 +99,36 @@ def test_save_overall_layout_png_defaults(tmp_path, monkeypatch):
     save_overall_layout_png(layout_cfg)
     out_file = tmp_path / "overall_layout.png"
     assert out_file.is_file() and out_file.stat().st_size > 0
+
+
+def test_save_png_rasterizes_polygons(tmp_path):
+    from PIL import Image
+
+    poly = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)])
+    config = PolygonLayoutConfig(
+        [poly], {}, {}, polygon_colors={0: (255, 0, 0)}, figsize=(2, 2)
+    )
+    out_cfg = LayoutOutputConfig(out_png=str(tmp_path / "raster.png"), dpi=50)
+    PolygonLayoutPlotter(config).save_png(out_cfg)
+    image = Image.open(out_cfg.out_png)
+    assert image.size == (100, 100)
+    r, g, b = image.getpixel((50, 60))
+    assert r > 200 and g < 100 and b < 100
+
+
+def test_save_png_honors_compress_level(tmp_path):
+    polys, labels, positions = simple_polygons()
+    plotter = PolygonLayoutPlotter(PolygonLayoutConfig(polys, labels, positions))
+    sizes = []
+    for level in (0, 9):
+        out_cfg = LayoutOutputConfig(
+            out_png=str(tmp_path / f"level{level}.png"), dpi=50, compress_level=level
+        )
+        plotter.save_png(out_cfg)
+        sizes.append(os.path.getsize(out_cfg.out_png))
+    assert sizes[0] > sizes[1]
+
+
+def test_font_resolves_bundled_dejavu():
+    assert _font(LABEL_FONT, 12).getname() == ("DejaVu Sans", "Bold")
+    assert _font(TITLE_FONT, 12).getname() == ("DejaVu Sans", "Book")
@@ -63,3 +63,24 @@ def test_clean_and_buffer_group_shape_raises_on_nonpolygon():
     ls = LineString([(0,0),(1,1)])
     with pytest.raises(ValueError):
         clean_and_buffer_group_shape(ls, 0.1)
+
+
+def test_seam_allowance_polygons_matches_per_group_helpers():
+    polygons = [
+        Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]),
+        Polygon([(1, 0), (2, 0), (1.5, 2)]),
+        Polygon([(5, 5), (6, 5), (6, 6)]),
+        Polygon([(10, 10), (11, 10), (11, 11), (10, 11)]),
+    ]
+    groups = [[2], [0, 1, 3]]
+    result = seam_allowance_polygons(polygons, groups, 0.1, 10)
+    for idx, group in enumerate(groups):
+        shape = group_polygons_to_shape(polygons, group)
+        expected = clean_and_buffer_group_shape(shape, 1.0)
+        assert result[idx].equals(expected)
+
+
+def test_seam_allowance_polygons_raises_on_empty_group():
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    with pytest.raises(ValueError):
+        seam_allowance_polygons([square], [[0], []])
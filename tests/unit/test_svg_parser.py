@@ -0,0 +1,101 @@
+import xml.etree.ElementTree as ET
+
+from shapely.geometry import LineString
+from svgpathtools import Line, parse_path
+
+from svg_parser import _straight_segments, clear_svg_cache, parse_svg
+
+SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="1in" viewBox="0 0 96 96">
+  <!-- comment -->
+  <line x1="0" y1="0" x2="10" y2="0" />
+  <path d="M 0 0 L 0 10 L 10 10" />
+  <polyline points="20,20 30,20" />
+  <circle cx="50" cy="50" r="5" />
+  <path d="M 40 40 Q 50 50 60 40" />
+</svg>
+"""
+
+
+def test_parse_svg_extracts_straight_segments(tmp_path):
+    path = tmp_path / "shapes.svg"
+    path.write_text(SVG)
+    lines = parse_svg(str(path))
+    coords = [list(line.coords) for line in lines]
+    # Paths come first, then polylines, then lines; curves are skipped.
+    assert coords == [
+        [(0, 0), (0, 10)],
+        [(0, 10), (10, 10)],
+        [(20, 20), (30, 20)],
+        [(0, 0), (10, 0)],
+    ]
+    assert all(isinstance(line, LineString) for line in lines)
+
+
+def test_parse_svg_reuses_given_tree(tmp_path):
+    path = tmp_path / "shapes.svg"
+    path.write_text(SVG)
+    tree = ET.parse(str(path))
+    path.unlink()
+    assert len(parse_svg(str(path), tree=tree)) == 4
+
+
+def test_parse_svg_without_straight_segments_returns_empty_list(tmp_path):
+    path = tmp_path / "curves.svg"
+    path.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg"><path d="M 0 0 Q 5 5 10 0" /></svg>'
+    )
+    assert parse_svg(str(path)) == []
+
+
+def test_parse_svg_includes_namespace_prefixed_elements(tmp_path):
+    path = tmp_path / "prefixed.svg"
+    path.write_text(
+        '<svg:svg xmlns:svg="http://www.w3.org/2000/svg">'
+        '<svg:path d="M0 0 L10 0"/><svg:line x1="0" y1="5" x2="0" y2="9"/>'
+        "</svg:svg>"
+    )
+    coords = [list(line.coords) for line in parse_svg(str(path))]
+    assert coords == [[(0, 0), (10, 0)], [(0, 5), (0, 9)]]
+
+
+def test_straight_segments_match_svgpathtools():
+    d = "m 10,10 h 5 v -2.5 l -1 1 2 2 Z M 0 0 20 0 V 4 z"
+    expected = [(seg.start, seg.end) for seg in parse_path(d) if isinstance(seg, Line)]
+    assert _straight_segments(d) == expected
+
+
+def test_straight_segments_defers_curves_and_bad_paths():
+    assert _straight_segments("M 0 0 Q 5 5 10 0") is None
+    assert _straight_segments("M 0 0 L 1") is None
+    assert _straight_segments("10 10") is None
+
+
+def test_parse_svg_caches_until_file_changes(tmp_path):
+    clear_svg_cache()
+    path = tmp_path / "shapes.svg"
+    path.write_text(SVG)
+    first = parse_svg(str(path))
+    again = parse_svg(str(path))
+    assert again == first and again is not first
+    assert all(a is b for a, b in zip(first, again))
+    path.write_text(SVG.replace('<line x1="0" y1="0" x2="10" y2="0" />', ""))
+    assert len(parse_svg(str(path))) == 3
+
+
+def test_parse_svg_drops_repeated_segments(tmp_path):
+    path = tmp_path / "shared.svg"
+    path.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        '<path d="M 0 0 L 10 0 L 10 10 Z" />'
+        '<path d="M 10 0 L 0 0 L 0 -10 Z" />'
+        "</svg>"
+    )
+    coords = [list(line.coords) for line in parse_svg(str(path))]
+    # The shared edge appears once, as first drawn.
+    assert coords == [
+        [(0, 0), (10, 0)],
+        [(10, 0), (10, 10)],
+        [(10, 10), (0, 0)],
+        [(0, 0), (0, -10)],
+        [(0, -10), (10, 0)],
+    ]
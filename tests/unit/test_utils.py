@@ -1,9 +1,20 @@
+import colorsys
+import random
+
+import numpy as np
 import pytest
+from shapely.affinity import affine_transform, rotate, translate
 from shapely.geometry import Polygon
 from utils import (
+    collinear,
+    centroid_coords,
+    collinear_mask,
+    exterior_coords,
     parse_length,
     remove_collinear_points,
+    remove_collinear_points_batch,
     get_distinct_colors,
+    rotation_matrix,
 )
 
 
@@ -29,6 +40,28 @@ def test_parse_length_invalid(invalid_str):
         parse_length(invalid_str)
 
 
+def test_collinear_mask_matches_scalar_collinear():
+    a = np.array([[0, 0], [0, 0]])
+    b = np.array([[1, 1], [1, 0]])
+    c = np.array([[2, 2], [1, 1]])
+    mask = collinear_mask(a, b, c)
+    assert mask.tolist() == [
+        collinear(tuple(p), tuple(q), tuple(r)) for p, q, r in zip(a, b, c)
+    ]
+    assert mask.tolist() == [True, False]
+
+
+def test_collinear_tolerance_scales_with_side_length():
+    # The middle point sits 0.005 units off a 100-unit side: within tol as a
+    # distance, although the doubled area (0.5) is far above it.
+    a, b, c = (0.0, 0.0), (50.0, 0.005), (100.0, 0.0)
+    assert collinear(a, b, c)
+    assert collinear_mask(np.array(a), np.array(b), np.array(c))
+    assert not collinear_mask(np.array(a), np.array(b), np.array(c), scaled=False)
+    # Below unit size the tolerance is not scaled down.
+    assert collinear((0.0, 0.0), (0.05, 0.05), (0.1, 0.0))
+
+
 def test_remove_collinear_points_removes_excess_points():
     # Triangle with extra collinear points along edges
     coords = [(0, 0), (0.5, 0), (1, 0), (1, 1), (0, 1), (0, 0)]
@@ -48,9 +81,107 @@ def test_remove_collinear_points_does_not_change_simple_shape():
     assert cleaned.equals(triangle)
 
 
+def test_remove_collinear_points_vectorized_path_matches_loop(monkeypatch):
+    # A square whose edges are densely subdivided, plus a few notches.
+    edge = [(x, 0.0) for x in range(40)] + [(40.0, y) for y in range(40)]
+    edge += [(40.0 - x, 40.0) for x in range(40)] + [(0.0, 40.0 - y) for y in range(40)]
+    edge[10] = (10.0, 0.5)
+    polygon = Polygon(edge)
+    vectorized = remove_collinear_points(polygon)
+    monkeypatch.setattr("utils.COLLINEAR_VECTORIZE_MIN", len(edge))
+    looped = remove_collinear_points(polygon)
+    assert vectorized.equals_exact(looped, 0)
+    assert len(vectorized.exterior.coords) == 8
+
+
 def test_get_distinct_colors_count_and_bounds():
     colors = get_distinct_colors(10, pastel=True)
     assert len(colors) == 10
     for rgb in colors:
         for channel in rgb:
             assert 0 <= channel <= 1
+
+
+def test_get_distinct_colors_matches_colorsys():
+    for pastel, (s, v) in ((True, (0.5, 0.85)), (False, (0.85, 0.9))):
+        random.seed(3)
+        colors = get_distinct_colors(24, pastel=pastel)
+        random.seed(3)
+        hues = [i / 24 for i in range(24)]
+        random.shuffle(hues)
+        assert colors == [colorsys.hsv_to_rgb(h, s, v) for h in hues]
+
+
+def test_rotation_matrix_combines_rotate_and_translate():
+    poly = Polygon([(0, 0), (3, 0), (1, 2)])
+    origin = poly.centroid.coords[0]
+    expected = translate(rotate(poly, 30, origin="centroid"), 5, -2)
+    result = affine_transform(poly, rotation_matrix(30, origin, 5, -2))
+    assert result.equals_exact(expected, 1e-9)
+
+
+def test_centroid_coords_matches_polygon_centroids():
+    polygons = [
+        Polygon([(0, 0), (3, 0), (1, 2)]),
+        Polygon([(0, 0), (4, 0), (4, 1), (0, 1)]),
+    ]
+    expected = [poly.centroid.coords[0] for poly in polygons]
+    assert centroid_coords(polygons).tolist() == [list(xy) for xy in expected]
+    assert centroid_coords([]).shape == (0, 2)
+
+
+def test_centroid_coords_gives_nan_row_for_empty_polygon():
+    polygons = [Polygon(), Polygon([(0, 0), (2, 0), (2, 2), (0, 2)])]
+    coords = centroid_coords(polygons)
+    assert np.isnan(coords[0]).all()
+    assert coords[1].tolist() == [1.0, 1.0]
+
+
+def test_exterior_coords_splits_rings_per_polygon():
+    polygons = [
+        Polygon([(0, 0), (3, 0), (1, 2)]),
+        Polygon(),
+        Polygon([(0, 0), (4, 0), (4, 1), (0, 1)]),
+    ]
+    coords = exterior_coords(polygons)
+    assert [c.shape for c in coords] == [(4, 2), (0, 2), (5, 2)]
+    assert np.array_equal(coords[2], np.asarray(polygons[2].exterior.coords))
+    assert exterior_coords([]) == []
+
+
+def test_remove_collinear_points_returns_input_when_nothing_to_drop():
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    assert remove_collinear_points(square) is square
+    triangle = Polygon([(0, 0), (1, 0), (0.5, 1)])
+    assert remove_collinear_points(triangle) is triangle
+    # Holes are still dropped, as before.
+    holed = Polygon(square.exterior.coords, [[(0.2, 0.2), (0.4, 0.2), (0.4, 0.4)]])
+    cleaned = remove_collinear_points(holed)
+    assert cleaned is not holed and cleaned.equals(square)
+
+
+def test_remove_collinear_points_batch_matches_per_polygon():
+    dense = [(x, 0.0) for x in range(20)] + [(20.0, 20.0), (0.0, 20.0)]
+    polygons = [
+        Polygon([(0, 0), (0.5, 0), (1, 0), (1, 1), (0, 1)]),
+        Polygon([(0, 0), (1, 0), (0.5, 1)]),
+        Polygon(dense),
+        Polygon([(0, 0), (9, 0), (9, 9)], [[(5, 1), (6, 1), (6, 2)]]),
+        Polygon(),
+    ]
+    batch = remove_collinear_points_batch(polygons)
+    assert len(batch) == len(polygons)
+    for poly, cleaned in zip(polygons, batch):
+        assert cleaned.equals_exact(remove_collinear_points(poly), 0)
+    # Untouched hole-free polygons are passed through as-is.
+    assert batch[1] is polygons[1]
+    assert remove_collinear_points_batch([]) == []
+
+
+def test_get_distinct_colors_seed_is_reproducible_and_isolated():
+    random.seed(42)
+    expected = get_distinct_colors(12)
+    state = random.getstate()
+    assert get_distinct_colors(12, seed=42) == expected
+    assert get_distinct_colors(12, seed=42) is not get_distinct_colors(12, seed=42)
+    assert random.getstate() == state
@@ -1,4 +1,5 @@
 import textwrap
+import xml.etree.ElementTree as ET
 import matplotlib
 import matplotlib.pyplot as plt
 import pytest
@@ -28,6 +29,24 @@ def test_get_svg_units_per_inch_valid(tmp_path):
     path = tmp_path / "test.svg"
     path.write_text(svg)
     assert get_svg_units_per_inch(str(path)) == pytest.approx(96.0)
+    tree = ET.parse(str(path))
+    assert get_svg_units_per_inch("unused.svg", tree=tree) == pytest.approx(96.0)
+
+
+def test_get_svg_units_per_inch_reads_only_the_root_tag(tmp_path):
+    # The body is never parsed, so content after the root start tag is not read.
+    svg = '<svg width="2in" viewBox="0 0 192 100"><path d="M 0 0 L 1 1" /><unclosed>'
+    path = tmp_path / "large.svg"
+    path.write_text(svg)
+    assert get_svg_units_per_inch(str(path)) == pytest.approx(96.0)
+
+
+def test_get_svg_units_per_inch_malformed_raises_parse_error(tmp_path):
+    path = tmp_path / "malformed.svg"
+    path.write_text('<svg width="1in" viewBox="0 0 96 96"')
+    with pytest.raises(ET.ParseError) as excinfo:
+        get_svg_units_per_inch(str(path))
+    assert excinfo.value.position[0] == 1
 
 
 def test_get_svg_units_per_inch_invalid(tmp_path):
@@ -54,3 +73,15 @@ def test_plot_functions(monkeypatch):
     plot_groups_with_seam_allowance(polys, groups, seam_allowances)
 
     assert len(show_calls) == 3
+
+
+def test_plot_functions_reuse_their_figures(monkeypatch):
+    monkeypatch.setattr(plt, "show", lambda: None)
+    polys, groups, seam_allowances = simple_polygons()
+    plt.close("all")
+    for _ in range(2):
+        plot_groups(polys, groups)
+        plot_polygons(polys, show_labels=True)
+        plot_groups_with_seam_allowance(polys, groups, seam_allowances)
+    assert len(plt.get_fignums()) == 3
+    plt.close("all")